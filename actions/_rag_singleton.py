@@ -0,0 +1,26 @@
+"""Process-wide access to the RAG pipeline shared by every action module."""
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    from .rag_pipeline import get_rag_pipeline
+    RAG_AVAILABLE = True
+    logger.info("✅ RAG pipeline module imported successfully")
+except ImportError as e:
+    logger.error("❌ Failed to import RAG pipeline: %s", e)
+    RAG_AVAILABLE = False
+except Exception as e:
+    logger.error("❌ Error importing RAG pipeline: %s", e)
+    RAG_AVAILABLE = False
+
+
+def get_pipeline():
+    """Return the shared RAG pipeline (built on first use), or None if it is unavailable."""
+    if not RAG_AVAILABLE:
+        return None
+    try:
+        return get_rag_pipeline()
+    except Exception as e:
+        logger.error("❌ Error initializing RAG pipeline: %s", e)
+        return None
@@ -1,40 +1,192 @@
-from typing import Any, Text, Dict, List
+from typing import Any, Text, Dict, List, Tuple
 from rasa_sdk import Action, Tracker
 from rasa_sdk.executor import CollectingDispatcher
 from rasa_sdk.events import SlotSet, SessionStarted, ActionExecuted, EventType
 from rasa_sdk.types import DomainDict
 
-import sys
+import asyncio
+import functools
 import os
 import logging
 import time
+from collections import OrderedDict
 from datetime import datetime
 
-# Add the actions directory to the path so we can import our rag_pipeline
-sys.path.append(os.path.dirname(__file__))
-
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("actions.log"),
-        logging.StreamHandler()
-    ]
-)
+# Set up logging, unless the action server (or an earlier import) already configured it
+if not logging.getLogger().handlers:
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler("actions.log"),
+            logging.StreamHandler()
+        ]
+    )
 logger = logging.getLogger(__name__)
 
-try:
-    from rag_pipeline import rag_pipeline
-    RAG_AVAILABLE = True
-    logger.info("✅ RAG pipeline imported successfully")
-    logger.info(f"📊 Knowledge base contains {len(rag_pipeline.documents)} documents")
-except ImportError as e:
-    logger.error(f"❌ Failed to import RAG pipeline: {e}")
-    RAG_AVAILABLE = False
-except Exception as e:
-    logger.error(f"❌ Error initializing RAG pipeline: {e}")
-    RAG_AVAILABLE = False
+# Shared, lazily built pipeline (one instance per process for all action modules)
+from ._rag_singleton import get_pipeline
+from .semantic_cache import SemanticCache
+
+# Exact-match answer cache: normalized query -> (response, source files).
+# Enabled by default; set RAG_EXACT_CACHE=0 to disable.
+EXACT_CACHE_ENABLED = os.environ.get("RAG_EXACT_CACHE", "1") == "1"
+EXACT_CACHE_MAX = 512
+_EXACT_CACHE: "OrderedDict[Text, Tuple[Text, List[Text]]]" = OrderedDict()
+
+# Queries that retrieved nothing: normalized query -> monotonic expiry time. Kept briefly so
+# repeated out-of-scope questions skip the encoder and index, but new documents still show up.
+NEGATIVE_CACHE_TTL = 60.0
+NEGATIVE_CACHE_MAX = 512
+_NEGATIVE_CACHE: "OrderedDict[Text, float]" = OrderedDict()
+
+# Semantic answer cache for paraphrased questions; threshold and TTL (seconds, 0 = no expiry)
+# are configurable through the environment.
+_SEMANTIC_CACHE = SemanticCache(
+    dim=384,
+    capacity=1024,
+    threshold=float(os.environ.get("RAG_SEMANTIC_CACHE_THRESHOLD", "0.95")),
+    ttl=float(os.environ.get("RAG_SEMANTIC_CACHE_TTL", "0")) or None
+)
+
+# Knowledge base status shown by the informational actions is refreshed at most this often (seconds)
+STATUS_TTL = 5
+
+
+@functools.lru_cache(maxsize=1)
+def _status(t_bucket: int) -> Tuple[bool, int, int]:
+    """(available, doc_count, unique_sources) of the pipeline; t_bucket only keys the cache"""
+    rag_pipeline = get_pipeline()
+    if rag_pipeline is None:
+        return False, 0, 0
+    return True, rag_pipeline.document_count, rag_pipeline.unique_source_count
+
+
+def _rag_status() -> Tuple[bool, int, int]:
+    """Knowledge base status, recomputed once per STATUS_TTL window"""
+    return _status(int(time.time()) // STATUS_TTL)
+
+
+# Only prefix the answer with the "Searching..." notice when retrieval took longer than this (seconds)
+SEARCHING_NOTICE_AFTER = 0.2
+
+# Static reply templates, built once per process; actions only format the dynamic status lines.
+_WELCOME_STATIC = """🤖 Hello! I'm your AI assistant with access to a comprehensive knowledge base. 
+
+I can help you with:
+• Answering questions based on my document collection
+• Providing detailed explanations on various topics
+• Searching through my knowledge base for specific information
+
+You can ask me complex questions, and I'll provide thorough answers with source references!"""
+_WELCOME_EMPTY_HINT = "\n💡 Use 'add documents' to learn how to add content to my knowledge base."
+
+_ADD_DOCUMENT_STATIC = """
+📥 **How to Add Documents to My Knowledge Base**
+
+**Step-by-Step Guide:**
+
+1. **Prepare Your Documents**
+   • Supported formats: PDF, TXT, DOCX
+   • Place files in: `knowledge_base/documents/` folder
+
+2. **Add Documents**
+   • Copy your files to the documents folder
+   • Run: `python setup_knowledge_base.py`
+   • Restart the action server: `rasa run actions`
+
+3. **Verification**
+   • Use: `check knowledge base` to confirm documents were added
+   • Test by asking questions about the new content
+
+**Best Practices:**
+• Use clear, well-structured documents for best results
+• Documents should be text-heavy (not image-based PDFs)
+• Ideal document size: 1-50 pages
+• Remove sensitive information before adding
+
+**Current Knowledge Base Status:**
+"""
+
+_HELP_STATIC = """
+🤖 **Comprehensive Help Guide**
+
+**How to Use Me Effectively:**
+
+🎯 **Ask Detailed Questions**
+• "Explain machine learning algorithms in detail"
+• "What are the key principles of project management?"
+• "Describe the process of neural network training"
+• "Compare and contrast different AI approaches"
+
+📚 **Knowledge Base Management**
+• "Check knowledge base" - See detailed status
+• "Add documents" - Learn how to expand my knowledge
+• "Search for [topic]" - Direct knowledge base search
+
+🔍 **Advanced Usage**
+• I can handle complex, multi-part questions
+• I provide detailed answers with source references
+• I can explain concepts from my knowledge base thoroughly
+• I include processing metadata in responses
+
+💡 **Example Questions:**
+• "What are the main types of artificial intelligence and their applications?"
+• "Explain how deep learning differs from traditional machine learning"
+• "Describe the key features of effective leadership according to my documents"
+
+📊 **System Information:**
+"""
+
+_HELP_FOOTER = "\nI'm ready to provide detailed, well-sourced answers! 🚀"
+_HELP_AVAILABLE_FOOTER = (
+    "• Response style: Detailed and comprehensive\n"
+    "• Source citation: Enabled\n"
+) + _HELP_FOOTER
+_HELP_UNAVAILABLE = _HELP_STATIC + "• Knowledge base: ❌ Unavailable\n" + _HELP_FOOTER
+
+_FALLBACK_STATIC = """
+❓ I'm not quite sure what you're asking.
+
+💡 **Here's how I can help you:**
+
+• Ask detailed questions about topics in my knowledge base
+• Request explanations of complex concepts
+• Search for specific information across my documents
+• Check what documents I have available
+• Learn how to add more content to my knowledge base
+
+🔍 **Try asking something like:**
+• "Explain artificial intelligence in detail"
+• "What do you know about machine learning?"
+• "Search for information about neural networks"
+• "Check knowledge base status"
+
+Or simply tell me what topic you're interested in!"""
+
+_CAPABILITIES_STATIC = """
+🚀 **My Enhanced Capabilities**
+
+**Advanced RAG System:**
+• 📚 Document understanding and retrieval
+• 🤖 AI-powered response generation
+• 🔍 Semantic search across knowledge base
+• 📊 Source citation and relevance scoring
+
+**What I Can Do:**
+• Answer complex, detailed questions
+• Provide comprehensive explanations
+• Search through multiple documents simultaneously
+• Generate well-structured, informative responses
+• Handle technical and conceptual questions
+
+**Knowledge Features:**
+• Multi-document comprehension
+• Context-aware responses
+• Detailed source referencing
+• Processing time optimization
+
+Ready to tackle your challenging questions! 💪"""
 
 
 class ActionSessionStart(Action):
@@ -47,30 +199,20 @@ class ActionSessionStart(Action):
         self, dispatcher: CollectingDispatcher, tracker: Tracker, domain: DomainDict
     ) -> List[EventType]:
         
-        # Enhanced welcome message
-        welcome_message = """🤖 Hello! I'm your AI assistant with access to a comprehensive knowledge base. 
-
-I can help you with:
-• Answering questions based on my document collection
-• Providing detailed explanations on various topics
-• Searching through my knowledge base for specific information
-
-You can ask me complex questions, and I'll provide thorough answers with source references!"""
-
-        dispatcher.utter_message(text=welcome_message)
+        dispatcher.utter_message(text=_WELCOME_STATIC)
         
         # Check if RAG system is available
-        if not RAG_AVAILABLE:
+        available, doc_count, _ = _rag_status()
+        if not available:
             dispatcher.utter_message(
                 text="⚠️ Note: My knowledge base system is currently unavailable. " \
                      "I'll only be able to answer basic questions."
             )
         else:
             # Show knowledge base status
-            doc_count = len(rag_pipeline.documents)
             status_msg = f"📚 My knowledge base is ready with {doc_count} document chunks."
             if doc_count == 0:
-                status_msg += "\n💡 Use 'add documents' to learn how to add content to my knowledge base."
+                status_msg += _WELCOME_EMPTY_HINT
             dispatcher.utter_message(text=status_msg)
 
         return [SessionStarted(), ActionExecuted("action_listen")]
@@ -82,17 +224,18 @@ class ActionSearchKnowledge(Action):
     def name(self) -> Text:
         return "action_search_knowledge"
 
-    def run(
+    async def run(
         self, 
         dispatcher: CollectingDispatcher,
         tracker: Tracker,
         domain: Dict[Text, Any]
     ) -> List[Dict[Text, Any]]:
         
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         # Check if RAG system is available
-        if not RAG_AVAILABLE:
+        rag_pipeline = get_pipeline()
+        if rag_pipeline is None:
             dispatcher.utter_message(
                 text="❌ I'm sorry, but my knowledge search system is currently unavailable. " \
                      "Please make sure the action server is running properly and check the logs for errors."
@@ -112,52 +255,111 @@ class ActionSearchKnowledge(Action):
         question_entity = next(tracker.get_latest_entity_values("question"), None)
         search_query = question_entity or user_message
         
-        logger.info(f"🔍 Processing search query: '{search_query}'")
+        logger.info("🔍 Processing search query: '%s'", search_query)
+        
+        cache_key = search_query.strip().lower()
+        if EXACT_CACHE_ENABLED and cache_key in _EXACT_CACHE:
+            logger.info("⚡ Exact cache hit for: '%s'", search_query)
+            _EXACT_CACHE.move_to_end(cache_key)
+            response, source_files = _EXACT_CACHE[cache_key]
+            self._utter_answer(dispatcher, response, source_files, start_time)
+            return self._search_slots(search_query)
+        
+        expires_at = _NEGATIVE_CACHE.get(cache_key) if EXACT_CACHE_ENABLED else None
+        if expires_at is not None:
+            if time.monotonic() < expires_at:
+                logger.info("⚡ Negative cache hit for: '%s'", search_query)
+                self._utter_not_found(dispatcher, search_query)
+                return self._search_slots(search_query)
+            del _NEGATIVE_CACHE[cache_key]
         
         try:
-            # Show searching message
-            dispatcher.utter_message(text="🔍 Searching my knowledge base for relevant information...")
+            # Encode once; concurrent conversations share a batched encoder call
+            query_embedding = await rag_pipeline.aencode_query(search_query)
             
-            # Search for relevant information in the knowledge base
-            similar_docs = rag_pipeline.search_similar(search_query, n_results=3)
+            # Reuse the answer to a near-identical earlier question if we have one
+            cached = _SEMANTIC_CACHE.lookup(query_embedding)
             
-            if similar_docs:
-                logger.info(f"✅ Found {len(similar_docs)} relevant documents")
-                
-                # Generate response using RAG
-                logger.info("🤖 Generating response...")
-                response = rag_pipeline.generate_response(search_query, similar_docs)
+            if cached is not None:
+                logger.info("⚡ Semantic cache hit for: '%s'", search_query)
+                response, source_files = cached
+                self._utter_answer(dispatcher, response, source_files, start_time)
                 
-                # Add source information
-                sources = list(set([doc['source'] for doc in similar_docs]))
-                source_files = [os.path.basename(src) for src in sources]
-                
-                # Calculate processing time
-                processing_time = time.time() - start_time
-                
-                # Create the FULL response with answer AND sources
-                full_response = f"{response}\n\n"
-                full_response += f"📚 **Sources**: {', '.join(source_files)}\n"
-                full_response += f"⏱️ **Processing time**: {processing_time:.2f}s"
+            else:
+                # Search for relevant information in the knowledge base
+                similar_docs = await rag_pipeline.asearch_by_embedding(query_embedding, n_results=3)
                 
-                # Send the complete response
-                dispatcher.utter_message(text=full_response)
+                # The dispatcher only sends messages once run() returns, so the searching
+                # notice is just noise unless the lookup was noticeably slow
+                if time.perf_counter() - start_time > SEARCHING_NOTICE_AFTER:
+                    dispatcher.utter_message(text="🔍 Searching my knowledge base for relevant information...")
                 
-                logger.info(f"✅ Successfully generated response in {processing_time:.2f}s")
-                
-            else:
-                logger.info(f"❌ No relevant documents found for: '{search_query}'")
-                dispatcher.utter_message(
-                    text=f"❌ I couldn't find relevant information about '{search_query}' in my knowledge base."
-                )
+                if similar_docs:
+                    logger.info("✅ Found %d relevant documents", len(similar_docs))
+                    
+                    # Generate response using RAG
+                    logger.info("🤖 Generating response...")
+                    # Run the blocking LLM call in a worker thread so other conversations keep being served
+                    response, source_files = await asyncio.get_running_loop().run_in_executor(
+                        None, rag_pipeline.generate_response, search_query, similar_docs
+                    )
+                    
+                    _SEMANTIC_CACHE.add(query_embedding, (response, source_files))
+                    if EXACT_CACHE_ENABLED:
+                        _EXACT_CACHE[cache_key] = (response, source_files)
+                        if len(_EXACT_CACHE) > EXACT_CACHE_MAX:
+                            _EXACT_CACHE.popitem(last=False)
+                    self._utter_answer(dispatcher, response, source_files, start_time)
+                    
+                else:
+                    logger.info("❌ No relevant documents found for: '%s'", search_query)
+                    if EXACT_CACHE_ENABLED:
+                        _NEGATIVE_CACHE[cache_key] = time.monotonic() + NEGATIVE_CACHE_TTL
+                        if len(_NEGATIVE_CACHE) > NEGATIVE_CACHE_MAX:
+                            _NEGATIVE_CACHE.popitem(last=False)
+                    self._utter_not_found(dispatcher, search_query)
                 
         except Exception as e:
-            logger.error(f"❌ Error in action_search_knowledge: {str(e)}", exc_info=True)
+            logger.error("❌ Error in action_search_knowledge: %s", e, exc_info=True)
             dispatcher.utter_message(
                 text=f"❌ I encountered an error while searching for information about '{search_query}'. Please try again."
             )
         
-        return [SlotSet("search_query", search_query), SlotSet("last_search_time", datetime.now().isoformat())]
+        return self._search_slots(search_query)
+
+    def _search_slots(self, search_query: Text) -> List[Dict[Text, Any]]:
+        """Slot events recording the query and when it was answered."""
+        return [SlotSet("search_query", search_query), SlotSet("last_search_time", f"{time.time():.3f}")]
+
+    def _utter_not_found(self, dispatcher: CollectingDispatcher, search_query: Text) -> None:
+        """Tell the user the knowledge base has nothing on the query."""
+        dispatcher.utter_message(
+            text=f"❌ I couldn't find relevant information about '{search_query}' in my knowledge base."
+        )
+
+    def _utter_answer(
+        self,
+        dispatcher: CollectingDispatcher,
+        response: Text,
+        source_files: List[Text],
+        start_time: float
+    ) -> None:
+        """Send the answer together with its sources and processing time."""
+        
+        # Calculate processing time
+        processing_time = time.perf_counter() - start_time
+        
+        # Create the FULL response with answer AND sources
+        full_response = (
+            f"{response}\n\n"
+            f"📚 **Sources**: {', '.join(source_files)}\n"
+            f"⏱️ **Processing time**: {processing_time:.2f}s"
+        )
+        
+        # Send the complete response
+        dispatcher.utter_message(text=full_response)
+        
+        logger.info("✅ Successfully generated response in %.2fs", processing_time)
 
 
 class ActionAddDocument(Action):
@@ -173,45 +375,20 @@ class ActionAddDocument(Action):
         domain: Dict[Text, Any]
     ) -> List[Dict[Text, Any]]:
         
-        instructions = """
-📥 **How to Add Documents to My Knowledge Base**
-
-**Step-by-Step Guide:**
-
-1. **Prepare Your Documents**
-   • Supported formats: PDF, TXT, DOCX
-   • Place files in: `knowledge_base/documents/` folder
-
-2. **Add Documents**
-   • Copy your files to the documents folder
-   • Run: `python setup_knowledge_base.py`
-   • Restart the action server: `rasa run actions`
-
-3. **Verification**
-   • Use: `check knowledge base` to confirm documents were added
-   • Test by asking questions about the new content
-
-**Best Practices:**
-• Use clear, well-structured documents for best results
-• Documents should be text-heavy (not image-based PDFs)
-• Ideal document size: 1-50 pages
-• Remove sensitive information before adding
-
-**Current Knowledge Base Status:**
-"""
+        parts = [_ADD_DOCUMENT_STATIC]
         
         # Add current status
-        if RAG_AVAILABLE:
-            doc_count = len(rag_pipeline.documents)
-            instructions += f"• Documents indexed: {doc_count}\n"
+        available, doc_count, _ = _rag_status()
+        if available:
+            parts.append(f"• Documents indexed: {doc_count}\n")
             if doc_count == 0:
-                instructions += "• ⚠️ No documents currently in knowledge base\n"
+                parts.append("• ⚠️ No documents currently in knowledge base\n")
         else:
-            instructions += "• ❌ Knowledge base unavailable\n"
+            parts.append("• ❌ Knowledge base unavailable\n")
         
-        instructions += "\nReady to expand my knowledge! 🚀"
+        parts.append("\nReady to expand my knowledge! 🚀")
 
-        dispatcher.utter_message(text=instructions)
+        dispatcher.utter_message(text="".join(parts))
         return []
 
 
@@ -228,39 +405,41 @@ class ActionCheckKnowledgeBase(Action):
         domain: Dict[Text, Any]
     ) -> List[Dict[Text, Any]]:
         
-        if not RAG_AVAILABLE:
+        available, total_documents, unique_sources = _rag_status()
+        if not available:
             dispatcher.utter_message(
                 text="❌ My knowledge base system is currently unavailable. Please check the action server logs."
             )
             return []
         
         try:
-            total_documents = len(rag_pipeline.documents)
-            unique_sources = len(set([doc['source'] for doc in rag_pipeline.metadata]))
-            
-            status_message = "📊 **Knowledge Base Detailed Status**\n\n"
-            status_message += f"• **Documents indexed**: {total_documents} chunks\n"
-            status_message += f"• **Unique source files**: {unique_sources}\n"
-            status_message += f"• **Search system**: ✅ Operational\n"
-            status_message += f"• **Response generation**: ✅ Active\n"
-            status_message += f"• **Running on**: CPU (Stable)\n"
-            status_message += f"• **Last update**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+            parts = [
+                "📊 **Knowledge Base Detailed Status**\n",
+                f"• **Documents indexed**: {total_documents} chunks",
+                f"• **Unique source files**: {unique_sources}",
+                "• **Search system**: ✅ Operational",
+                "• **Response generation**: ✅ Active",
+                "• **Running on**: CPU (Stable)",
+                f"• **Last update**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+            ]
             
             if total_documents > 0:
                 # Show some sample sources
-                sample_sources = list(set([os.path.basename(doc['source']) for doc in rag_pipeline.metadata[:5]]))
-                status_message += f"• **Sample documents**: {', '.join(sample_sources)}\n"
+                sample_sources = get_pipeline().get_stats()['sample_sources']
+                parts.append(f"• **Sample documents**: {', '.join(sample_sources)}")
                 
                 if total_documents > 5:
-                    status_message += f"• **And {total_documents - 5} more chunks...**\n"
+                    parts.append(f"• **And {total_documents - 5} more chunks...**")
+                # Keep the trailing newline the message has always ended with
+                parts.append("")
             else:
-                status_message += "\n⚠️ **No documents in knowledge base**\n"
-                status_message += "Use 'add documents' to get started and expand my knowledge!"
+                parts.append("\n⚠️ **No documents in knowledge base**")
+                parts.append("Use 'add documents' to get started and expand my knowledge!")
             
-            dispatcher.utter_message(text=status_message)
+            dispatcher.utter_message(text="\n".join(parts))
             
         except Exception as e:
-            logger.error(f"❌ Error checking knowledge base: {e}")
+            logger.error("❌ Error checking knowledge base: %s", e)
             dispatcher.utter_message(
                 text="❌ Unable to check knowledge base status at the moment. Please try again later."
             )
@@ -281,46 +460,13 @@ class ActionProvideHelp(Action):
         domain: Dict[Text, Any]
     ) -> List[Dict[Text, Any]]:
         
-        help_text = """
-🤖 **Comprehensive Help Guide**
-
-**How to Use Me Effectively:**
-
-🎯 **Ask Detailed Questions**
-• "Explain machine learning algorithms in detail"
-• "What are the key principles of project management?"
-• "Describe the process of neural network training"
-• "Compare and contrast different AI approaches"
-
-📚 **Knowledge Base Management**
-• "Check knowledge base" - See detailed status
-• "Add documents" - Learn how to expand my knowledge
-• "Search for [topic]" - Direct knowledge base search
-
-🔍 **Advanced Usage**
-• I can handle complex, multi-part questions
-• I provide detailed answers with source references
-• I can explain concepts from my knowledge base thoroughly
-• I include processing metadata in responses
-
-💡 **Example Questions:**
-• "What are the main types of artificial intelligence and their applications?"
-• "Explain how deep learning differs from traditional machine learning"
-• "Describe the key features of effective leadership according to my documents"
-
-📊 **System Information:**
-"""
-        
-        # Add system status
-        if RAG_AVAILABLE:
-            doc_count = len(rag_pipeline.documents)
-            help_text += f"• Knowledge base: {doc_count} document chunks ready\n"
-            help_text += "• Response style: Detailed and comprehensive\n"
-            help_text += "• Source citation: Enabled\n"
+        # Only the system status line depends on the pipeline
+        available, doc_count, _ = _rag_status()
+        if available:
+            status = f"• Knowledge base: {doc_count} document chunks ready\n"
+            help_text = _HELP_STATIC + status + _HELP_AVAILABLE_FOOTER
         else:
-            help_text += "• Knowledge base: ❌ Unavailable\n"
-        
-        help_text += "\nI'm ready to provide detailed, well-sourced answers! 🚀"
+            help_text = _HELP_UNAVAILABLE
 
         dispatcher.utter_message(text=help_text)
         return []
@@ -339,26 +485,7 @@ class ActionFallback(Action):
         domain: Dict[Text, Any]
     ) -> List[Dict[Text, Any]]:
         
-        fallback_text = """
-❓ I'm not quite sure what you're asking.
-
-💡 **Here's how I can help you:**
-
-• Ask detailed questions about topics in my knowledge base
-• Request explanations of complex concepts
-• Search for specific information across my documents
-• Check what documents I have available
-• Learn how to add more content to my knowledge base
-
-🔍 **Try asking something like:**
-• "Explain artificial intelligence in detail"
-• "What do you know about machine learning?"
-• "Search for information about neural networks"
-• "Check knowledge base status"
-
-Or simply tell me what topic you're interested in!"""
-
-        dispatcher.utter_message(text=fallback_text)
+        dispatcher.utter_message(text=_FALLBACK_STATIC)
         return []
 
 
@@ -375,31 +502,7 @@ class ActionShowCapabilities(Action):
         domain: Dict[Text, Any]
     ) -> List[Dict[Text, Any]]:
         
-        capabilities = """
-🚀 **My Enhanced Capabilities**
-
-**Advanced RAG System:**
-• 📚 Document understanding and retrieval
-• 🤖 AI-powered response generation
-• 🔍 Semantic search across knowledge base
-• 📊 Source citation and relevance scoring
-
-**What I Can Do:**
-• Answer complex, detailed questions
-• Provide comprehensive explanations
-• Search through multiple documents simultaneously
-• Generate well-structured, informative responses
-• Handle technical and conceptual questions
-
-**Knowledge Features:**
-• Multi-document comprehension
-• Context-aware responses
-• Detailed source referencing
-• Processing time optimization
-
-Ready to tackle your challenging questions! 💪"""
-
-        dispatcher.utter_message(text=capabilities)
+        dispatcher.utter_message(text=_CAPABILITIES_STATIC)
         return []
 
 
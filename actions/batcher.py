@@ -0,0 +1,62 @@
+"""Micro-batching of concurrent embedding and search requests."""
+import asyncio
+from typing import Any, Callable, List, Sequence
+
+
+class MicroBatcher:
+    """Coalesce concurrent single-item requests into one batched call.
+    
+    Requests that arrive within max_wait seconds of the first one (up to
+    max_batch_size) are handed to batch_fn together; it must return one
+    result per item, in order. batch_fn runs in the default executor so the
+    event loop keeps serving other conversations.
+    """
+    
+    def __init__(self, batch_fn: Callable[[List[Any]], Sequence[Any]],
+                 max_batch_size: int = 32, max_wait: float = 0.01):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._queue = None
+        self._worker = None
+    
+    async def submit(self, item: Any) -> Any:
+        """Return the result for item once its batch has been processed"""
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+        
+        future = loop.create_future()
+        await self._queue.put((item, future))
+        return await future
+    
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            
+            # Collect whatever else arrives inside the batching window
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            try:
+                results = await loop.run_in_executor(
+                    None, self.batch_fn, [item for item, _ in batch]
+                )
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            for result, (_, future) in zip(results, batch):
+                if not future.done():
+                    future.set_result(result)
@@ -0,0 +1,67 @@
+"""Text extraction for knowledge base documents.
+
+Kept free of model/FAISS imports so it can run cheaply in worker processes.
+"""
+
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
+
+def _extract_pdf_text(file_path: str) -> str:
+    """Extract PDF text with pypdfium2 when installed, falling back to PyPDF2"""
+    pages = []
+    if pdfium is not None:
+        try:
+            pdf = pdfium.PdfDocument(file_path)
+            try:
+                for page in pdf:
+                    textpage = page.get_textpage()
+                    pages.append(textpage.get_text_range())
+                    textpage.close()
+                    page.close()
+            finally:
+                pdf.close()
+            return _join_pages(pages)
+        except Exception as e:
+            print(f"⚠️ pypdfium2 could not read {file_path}, falling back to PyPDF2: {e}")
+            pages = []
+    
+    import PyPDF2
+    with open(file_path, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        pages = [page.extract_text() for page in pdf_reader.pages]
+    return _join_pages(pages)
+
+
+def _join_pages(pages) -> str:
+    """Join page texts, one newline after each, and rejoin words hyphenated across line breaks
+    
+    The hyphen fix has to run before chunk_text collapses whitespace, or
+    "exam-\nple" would be indexed as "exam- ple".
+    """
+    if not pages:
+        return ""
+    text = "\n".join(pages) + "\n"
+    return text.replace("-\r\n", "").replace("-\n", "")
+
+
+def extract_text(file_path: str) -> str:
+    """Extract raw text from a PDF, TXT or DOCX file"""
+    text = ""
+    try:
+        if file_path.endswith('.pdf'):
+            text = _extract_pdf_text(file_path)
+        elif file_path.endswith('.txt'):
+            with open(file_path, 'r', encoding='utf-8') as file:
+                text = file.read()
+        elif file_path.endswith('.docx'):
+            import docx
+            doc = docx.Document(file_path)
+            text = '\n'.join([paragraph.text for paragraph in doc.paragraphs])
+    except Exception as e:
+        print(f"❌ Failed to read {file_path}: {e}")
+        return ""
+    return text
@@ -1,28 +1,40 @@
 # memory_optimizer.py
-import torch
 import gc
-import psutil
 import os
 
-def optimize_memory_usage():
-    """Optimize memory usage for low VRAM systems"""
+# The CUDA caching allocator reads PYTORCH_CUDA_ALLOC_CONF once, on first CUDA use;
+# setting it afterwards is a no-op, so it has to happen before torch is initialized.
+os.environ.setdefault('PYTORCH_CUDA_ALLOC_CONF', 'max_split_size_mb:128')
+os.environ.setdefault('TOKENIZERS_PARALLELISM', 'false')
+
+# torch and psutil are imported inside the functions so importing this module stays cheap
+
+def optimize_memory_usage(sync: bool = False, reserved_threshold_mb: int = 256):
+    """Optimize memory usage for low VRAM systems
+    
+    The GPU cache is only released once the allocator holds more than
+    reserved_threshold_mb. Pass sync=True to wait for in-flight CUDA work
+    first; this stalls the device, so avoid it while a model is generating.
+    """
+    import torch
     
     # Clear GPU cache
     if torch.cuda.is_available():
-        torch.cuda.empty_cache()
-        torch.cuda.synchronize()
+        if sync:
+            torch.cuda.synchronize()
+        if torch.cuda.memory_reserved() > reserved_threshold_mb * 1024**2:
+            torch.cuda.empty_cache()
     
     # Force garbage collection
     gc.collect()
     
-    # Set memory efficient settings
-    os.environ['PYTORCH_CUDA_ALLOC_CONF'] = 'max_split_size_mb:128'
-    os.environ['TOKENIZERS_PARALLELISM'] = 'false'
-    
     print("🧠 Memory optimized for low VRAM usage")
 
 def get_memory_info():
     """Get current memory usage information"""
+    import psutil
+    import torch
+    
     if torch.cuda.is_available():
         gpu_memory = torch.cuda.memory_allocated() / 1024**3  # GB
         gpu_memory_max = torch.cuda.max_memory_allocated() / 1024**3
@@ -4,26 +4,13 @@ from rasa_sdk.executor import CollectingDispatcher
 from rasa_sdk.events import SlotSet, SessionStarted, ActionExecuted, EventType
 from rasa_sdk.types import DomainDict
 
-import sys
-import os
 import logging
 
-# Add the actions directory to the path so we can import our rag_pipeline
-sys.path.append(os.path.dirname(__file__))
-
 # Set up logging
 logger = logging.getLogger(__name__)
 
-try:
-    from rag_pipeline import rag_pipeline
-    RAG_AVAILABLE = True
-    logger.info("RAG pipeline imported successfully")
-except ImportError as e:
-    logger.error(f"Failed to import RAG pipeline: {e}")
-    RAG_AVAILABLE = False
-except Exception as e:
-    logger.error(f"Error initializing RAG pipeline: {e}")
-    RAG_AVAILABLE = False
+# Shared, lazily built pipeline (one instance per process for all action modules)
+from ._rag_singleton import get_pipeline
 
 
 class ActionSessionStart(Action):
@@ -43,7 +30,7 @@ class ActionSessionStart(Action):
         )
         
         # Check if RAG system is available
-        if not RAG_AVAILABLE:
+        if get_pipeline() is None:
             dispatcher.utter_message(
                 text="Note: My knowledge base system is currently unavailable. " \
                      "I'll only be able to answer basic questions."
@@ -66,7 +53,8 @@ class ActionSearchKnowledge(Action):
     ) -> List[Dict[Text, Any]]:
         
         # Check if RAG system is available
-        if not RAG_AVAILABLE:
+        rag_pipeline = get_pipeline()
+        if rag_pipeline is None:
             dispatcher.utter_message(
                 text="I'm sorry, but my knowledge search system is currently unavailable. " \
                      "Please make sure the action server is running properly."
@@ -86,7 +74,7 @@ class ActionSearchKnowledge(Action):
         question_entity = next(tracker.get_latest_entity_values("question"), None)
         search_query = question_entity or user_message
         
-        logger.info(f"Processing search query: {search_query}")
+        logger.info("Processing search query: %s", search_query)
         
         try:
             # Show typing indicator (simulated)
@@ -97,12 +85,11 @@ class ActionSearchKnowledge(Action):
             
             if similar_docs:
                 # Generate response using RAG
-                logger.info(f"Found {len(similar_docs)} relevant documents, generating response...")
-                response = rag_pipeline.generate_response(search_query, similar_docs)
+                logger.info("Found %d relevant documents, generating response...", len(similar_docs))
+                response, source_files = rag_pipeline.generate_response(search_query, similar_docs)
                 
                 # Add source information
-                sources = list(set([doc['source'] for doc in similar_docs]))
-                source_info = f"\n\n📚 Sources: {', '.join([os.path.basename(src) for src in sources])}"
+                source_info = f"\n\n📚 Sources: {', '.join(source_files)}"
                 
                 full_response = response + source_info
                 dispatcher.utter_message(text=full_response)
@@ -118,7 +105,7 @@ class ActionSearchKnowledge(Action):
                 )
                 
         except Exception as e:
-            logger.error(f"Error in action_search_knowledge: {str(e)}", exc_info=True)
+            logger.error("Error in action_search_knowledge: %s", e, exc_info=True)
             dispatcher.utter_message(
                 text="I encountered an error while searching for information. " \
                      "Please try again in a moment."
@@ -172,26 +159,30 @@ class ActionCheckKnowledgeBase(Action):
         domain: Dict[Text, Any]
     ) -> List[Dict[Text, Any]]:
         
-        if not RAG_AVAILABLE:
+        rag_pipeline = get_pipeline()
+        if rag_pipeline is None:
             dispatcher.utter_message(
                 text="My knowledge base system is currently unavailable."
             )
             return []
         
         try:
-            total_documents = len(rag_pipeline.documents)
-            status_message = f"📊 Knowledge Base Status:\n"
-            status_message += f"• Documents indexed: {total_documents}\n"
-            status_message += f"• Search system: ✅ Operational\n"
-            status_message += f"• LLM: ✅ Ready\n"
+            total_documents = rag_pipeline.document_count
+            parts = [
+                "📊 Knowledge Base Status:",
+                f"• Documents indexed: {total_documents}",
+                "• Search system: ✅ Operational",
+                "• LLM: ✅ Ready",
+                "",
+            ]
             
             if total_documents == 0:
-                status_message += "\n⚠️ No documents in knowledge base. Use 'add documents' to get started."
+                parts.append("⚠️ No documents in knowledge base. Use 'add documents' to get started.")
             
-            dispatcher.utter_message(text=status_message)
+            dispatcher.utter_message(text="\n".join(parts))
             
         except Exception as e:
-            logger.error(f"Error checking knowledge base: {e}")
+            logger.error("Error checking knowledge base: %s", e)
             dispatcher.utter_message(
                 text="Unable to check knowledge base status at the moment."
             )
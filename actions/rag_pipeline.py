@@ -1,21 +1,139 @@
+import asyncio
 import os
 import faiss
 import numpy as np
 from sentence_transformers import SentenceTransformer
 from transformers import (
     AutoModelForCausalLM, 
-    AutoTokenizer,
-    pipeline
+    AutoTokenizer
 )
 import torch
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
+from collections import OrderedDict
+import functools
+import hashlib
+import itertools
+import json
 import pickle
+import sqlite3
+import threading
+
+from .batcher import MicroBatcher
+from .document_loader import extract_text
+from .semantic_cache import SemanticCache
+
+# Optional INT8 ONNX runtime for the embedding model (see export_onnx_encoder.py)
+try:
+    import onnxruntime as ort
+except ImportError:
+    ort = None
+
+# Optional llama.cpp runtime for a quantized GGUF build of the LLM (see export_gguf_llm.py)
+try:
+    from llama_cpp import Llama
+except ImportError:
+    Llama = None
 
 # FORCE CPU USAGE - Guaranteed stable
 os.environ["CUDA_VISIBLE_DEVICES"] = "-1"
 
+# Give each forward pass every core; the action server already runs requests concurrently,
+# so extra inter-op threads would only compete with the intra-op pool
+torch.set_num_threads(os.cpu_count() or 1)
+try:
+    torch.set_num_interop_threads(1)
+except RuntimeError:
+    # Only settable before torch has run any parallel work in this process
+    pass
+
 print("🚀 Initializing Enhanced RAG Pipeline...")
 
+
+class OnnxSentenceEncoder:
+    """SentenceTransformer-compatible encoder running an INT8 ONNX export of MiniLM"""
+    
+    def __init__(self, model_dir: str, model_file: str = "model_quantized.onnx", max_seq_length: int = 256):
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.session = ort.InferenceSession(
+            os.path.join(model_dir, model_file),
+            providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.max_seq_length = max_seq_length
+    
+    def encode(self, sentences: List[str], batch_size: int = 32, show_progress_bar: bool = False,
+               convert_to_numpy: bool = True, normalize_embeddings: bool = False) -> np.ndarray:
+        """Mean-pooled sentence embeddings, shaped like SentenceTransformer.encode output"""
+        # Encode longest-first so each batch pads to a similar length
+        order = np.argsort([-len(s) for s in sentences], kind='stable')
+        embeddings = None
+        
+        for start in range(0, len(sentences), batch_size):
+            batch_idx = order[start:start + batch_size]
+            encoded = self.tokenizer(
+                [sentences[i] for i in batch_idx],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors='np'
+            )
+            feeds = {k: v.astype('int64') for k, v in encoded.items() if k in self.input_names}
+            token_embeddings = self.session.run(None, feeds)[0]
+            
+            mask = encoded['attention_mask'][..., None].astype('float32')
+            pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            
+            if embeddings is None:
+                embeddings = np.empty((len(sentences), pooled.shape[1]), dtype='float32')
+            embeddings[batch_idx] = pooled
+        
+        if embeddings is None:
+            return np.empty((0, 0), dtype='float32')
+        if normalize_embeddings:
+            embeddings /= np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+        return embeddings
+
+
+class LlamaCppGenerator:
+    """Text-generation pipeline stand-in running a quantized GGUF model through llama.cpp"""
+    
+    def __init__(self, model_path: str, n_ctx: int = 1024):
+        self.llm = Llama(model_path=model_path, n_ctx=n_ctx, n_threads=os.cpu_count(), verbose=False)
+    
+    def __call__(self, prompt: str, max_new_tokens: int = 200, temperature: float = 0.8,
+                 top_p: float = 0.9, repetition_penalty: float = 1.1, **kwargs) -> List[Dict[str, str]]:
+        """Generate a continuation, returned with the prompt like the HF pipeline does"""
+        output = self.llm(
+            prompt,
+            max_tokens=max_new_tokens,
+            temperature=temperature,
+            top_p=top_p,
+            repeat_penalty=repetition_penalty
+        )
+        return [{'generated_text': prompt + output['choices'][0]['text']}]
+
+
+class TorchGenerator:
+    """Text-generation pipeline stand-in calling model.generate directly"""
+    
+    def __init__(self, model, tokenizer):
+        self.model = model
+        self.tokenizer = tokenizer
+        # Keep the prompt tail ("Answer:") when truncating, and leave room for the reply
+        self.tokenizer.truncation_side = 'left'
+        self.max_prompt_tokens = model.config.n_positions - model.generation_config.max_new_tokens
+    
+    def __call__(self, prompt: str, **kwargs) -> List[Dict[str, str]]:
+        """Generate a continuation, returned with the prompt like the HF pipeline does"""
+        inputs = self.tokenizer(prompt, return_tensors='pt', truncation=True,
+                                max_length=self.max_prompt_tokens)
+        with torch.inference_mode():
+            # Sampling parameters and use_cache come from the model's generation config
+            output = self.model.generate(**inputs, **kwargs)
+        text = self.tokenizer.decode(output[0, inputs['input_ids'].shape[1]:], skip_special_tokens=True)
+        return [{'generated_text': prompt + text}]
+
+
 class EnhancedRAGPipeline:
     def __init__(self, knowledge_base_path: str = "knowledge_base/documents/"):
         self.knowledge_base_path = knowledge_base_path
@@ -26,27 +144,101 @@ class EnhancedRAGPipeline:
         self.index = None
         self.documents = []
         self.metadata = []
+        self.source_hashes = {}  # file path -> SHA-256 of the encoder id + text that was indexed
         
         # FAISS configuration
         self.index_path = "vector_db/faiss_index.index"
-        self.metadata_path = "vector_db/faiss_metadata.pkl"
+        self.documents_path = "vector_db/faiss_documents.jsonl"
+        self.chunk_metadata_path = "vector_db/faiss_metadata.jsonl"
+        self.sources_path = "vector_db/faiss_sources.json"
+        self.metadata_path = "vector_db/faiss_metadata.pkl"  # legacy pickle, read once and migrated
+        self._persisted_count = 0  # rows of documents/metadata already in the jsonl files
+        self.hnsw_m = 32
+        self.hnsw_ef_construction = 200
+        self.hnsw_ef_search = 64
+        # The int8 scalar quantizer learns per-dimension ranges from its training set;
+        # below this many vectors the index stays exact (flat) so a tiny first batch
+        # cannot fix those ranges for good
+        self.sq_min_train = 1000
+        
+        # INT8 ONNX export of the embedding model, used when present
+        self.onnx_model_dir = "vector_db/minilm_onnx"
+        self.embedding_model_id = None
+        
+        # Quantized GGUF build of the LLM for llama.cpp, used when present (export_gguf_llm.py)
+        self.llm_gguf_path = "vector_db/dialogpt-medium-q4_0.gguf"
+        # torch.compile the LLM forward pass; off by default since compiling costs
+        # seconds per new prompt shape and the CPU gains are small for DialoGPT
+        self.llm_compile = os.environ.get("RAG_TORCH_COMPILE") == "1"
+        # The LLM is loaded on first generation, so ingestion and retrieval never pay for it
+        self._llm_loaded = False
+        self._llm_lock = threading.Lock()
+        
+        # Embedding caches: in-memory LRU for queries, SQLite on disk for queries and chunks
+        self.embed_cache_path = "vector_db/embed_cache.db"
+        self.embed_cache_size = 1024
+        self._embed_cache = OrderedDict()
+        self._embed_db = None
+        self._embed_lock = threading.Lock()
+        
+        # Concurrent requests share batched encoder calls and FAISS searches
+        self._encode_batcher = MicroBatcher(self._encode_query_rows, max_batch_size=32)
+        self._search_batcher = MicroBatcher(self._search_batch, max_batch_size=16)
+        
+        # Set when the loaded index is memory-mapped read-only
+        self._index_mmapped = False
+        
+        # Knowledge base summary, rebuilt only when documents change
+        self._stats_cache = None
+        
+        # Retrieval results of recent queries, reused for near-duplicate query embeddings
+        self._result_cache = SemanticCache(dim=384, capacity=1024, threshold=0.95)
+        self._result_cache_lock = threading.Lock()
         
-        self._setup_models()
+        self._setup_embedding_model()
         self._setup_faiss_index()
+        self._setup_embed_cache()
     
-    def _setup_models(self):
-        """Initialize models with better performance"""
+    def _setup_embedding_model(self):
+        """Initialize the embedding model"""
         print("📥 Loading embedding model...")
         
-        # Lightweight embedding model
-        self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2', device='cpu')
+        # Lightweight embedding model: INT8 ONNX export if available, FP32 PyTorch otherwise
+        onnx_path = os.path.join(self.onnx_model_dir, "model_quantized.onnx")
+        if ort is not None and os.path.exists(onnx_path):
+            self.embedding_model = OnnxSentenceEncoder(self.onnx_model_dir)
+            self.embedding_model_id = "all-MiniLM-L6-v2-onnx-int8"
+            print("✅ Using INT8 ONNX embedding model")
+        else:
+            self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2', device='cpu')
+            self.embedding_model_id = "all-MiniLM-L6-v2"
         self.embedding_dim = 384
-        
+        # Cap transformer work per chunk (attention cost grows quadratically with length)
+        self.embedding_model.max_seq_length = 256
+    
+    def _ensure_llm(self):
+        """Load the LLM on first use; concurrent first calls load it once"""
+        if self._llm_loaded:
+            return
+        with self._llm_lock:
+            if not self._llm_loaded:
+                self._setup_llm()
+                self._llm_loaded = True
+    
+    def _setup_llm(self):
+        """Initialize the LLM used for answer generation"""
         print("📥 Loading LLM...")
         
         # Try a different, more capable model
         model_name = "microsoft/DialoGPT-medium"  # Upgraded to medium for better responses
         
+        # int4 weights through llama.cpp move far fewer bytes per token than FP32 torch;
+        # the GGUF file carries its own tokenizer (export_gguf_llm.py builds it)
+        if Llama is not None and os.path.exists(self.llm_gguf_path):
+            self.generator = LlamaCppGenerator(self.llm_gguf_path)
+            print("✅ LLM loaded successfully (quantized GGUF)")
+            return
+        
         try:
             self.tokenizer = AutoTokenizer.from_pretrained(model_name)
             
@@ -56,23 +248,10 @@ class EnhancedRAGPipeline:
             
             # Load model
             self.llm = AutoModelForCausalLM.from_pretrained(model_name)
+            self._configure_generation()
+            self.generator = TorchGenerator(self.llm, self.tokenizer)
             
-            # Create pipeline with better parameters
-            self.generator = pipeline(
-                "text-generation",
-                model=self.llm,
-                tokenizer=self.tokenizer,
-                device=-1,
-                max_new_tokens=200,  # Increased for better responses
-                do_sample=True,
-                temperature=0.8,     # Slightly higher for more creative responses
-                top_p=0.9,           # Nucleus sampling
-                repetition_penalty=1.1,  # Reduce repetition
-                pad_token_id=self.tokenizer.eos_token_id,
-                torch_dtype=torch.float32
-            )
-            
-            print("✅ All models loaded successfully")
+            print("✅ LLM loaded successfully")
             
         except Exception as e:
             print(f"❌ Model loading failed: {e}, falling back to small model")
@@ -82,109 +261,583 @@ class EnhancedRAGPipeline:
             if self.tokenizer.pad_token is None:
                 self.tokenizer.pad_token = self.tokenizer.eos_token
             self.llm = AutoModelForCausalLM.from_pretrained(model_name)
-            self.generator = pipeline(
-                "text-generation",
-                model=self.llm,
-                tokenizer=self.tokenizer,
-                device=-1,
-                max_new_tokens=150,
-                do_sample=True,
-                temperature=0.7,
-                pad_token_id=self.tokenizer.eos_token_id
-            )
+            self._configure_generation()
+            self.generator = TorchGenerator(self.llm, self.tokenizer)
             print("✅ Fallback to DialoGPT-small loaded")
     
+    def _configure_generation(self):
+        """Set sampling parameters once on the model so generation calls need no overrides"""
+        self.tokenizer.padding_side = 'left'
+        self.llm.generation_config.update(
+            max_new_tokens=200,      # Increased for better responses
+            do_sample=True,
+            temperature=0.8,         # Slightly higher for more creative responses
+            top_p=0.9,               # Nucleus sampling
+            repetition_penalty=1.1,  # Reduce repetition
+            pad_token_id=self.tokenizer.eos_token_id,
+            use_cache=True
+        )
+        self.llm.eval()
+        if self.llm_compile and hasattr(torch, 'compile'):
+            # Compile forward only; generate() calls it once per new token
+            self.llm.forward = torch.compile(self.llm.forward, dynamic=True)
+    
     def _setup_faiss_index(self):
         """Initialize or load FAISS index"""
         print("🔍 Setting up FAISS index...")
         
+        # Use every core for index builds and batched searches
+        faiss.omp_set_num_threads(os.cpu_count() or 1)
+        
         os.makedirs("vector_db", exist_ok=True)
         
-        if os.path.exists(self.index_path) and os.path.exists(self.metadata_path):
-            self.index = faiss.read_index(self.index_path)
-            with open(self.metadata_path, 'rb') as f:
-                data = pickle.load(f)
-                self.documents = data['documents']
-                self.metadata = data['metadata']
+        has_jsonl = os.path.exists(self.documents_path) and os.path.exists(self.chunk_metadata_path)
+        if os.path.exists(self.index_path) and (has_jsonl or os.path.exists(self.metadata_path)):
+            self.index = self._read_index()
+            if has_jsonl:
+                self.documents, documents_whole = self._read_jsonl(self.documents_path)
+                self.metadata, metadata_whole = self._read_jsonl(self.chunk_metadata_path)
+                if os.path.exists(self.sources_path):
+                    with open(self.sources_path, 'r', encoding='utf-8') as f:
+                        self.source_hashes = json.load(f)
+                # A torn line must not stay in the file for the next append to land on
+                self._persisted_count = len(self.documents) if documents_whole and metadata_whole else 0
+            else:
+                with open(self.metadata_path, 'rb') as f:
+                    data = pickle.load(f)
+                    self.documents = data['documents']
+                    self.metadata = data['metadata']
+                    self.source_hashes = data.get('source_hashes', {})
+                # Indexes written before basenames were stored at ingest
+                for meta in self.metadata:
+                    if 'source_basename' not in meta:
+                        meta['source_basename'] = os.path.basename(meta['source'])
+            if not self._align_loaded_rows() and not has_jsonl:
+                self._migrate_legacy_metadata()
             print(f"✅ Loaded FAISS index with {len(self.documents)} documents")
         else:
-            self.index = faiss.IndexFlatIP(self.embedding_dim)
+            self.index = self._create_faiss_index()
             self.documents = []
             self.metadata = []
+            self.source_hashes = {}
             print("✅ Created new FAISS index")
     
+    def _align_loaded_rows(self) -> bool:
+        """Cut documents, metadata and the index to the rows all three hold
+        
+        A save interrupted after the jsonl append leaves surplus rows; a torn
+        jsonl line leaves surplus vectors. Files whose rows were (or may have
+        been) cut lose their source hash, so the next ingest indexes them again.
+        Returns True if anything was cut; the repaired state is then saved.
+        """
+        count = min(len(self.documents), len(self.metadata), self.index.ntotal)
+        if count == len(self.documents) == len(self.metadata) == self.index.ntotal:
+            return False
+        
+        # Rows are cut from the tail, so the last surviving file may be incomplete too
+        lost = {meta['source'] for meta in self.metadata[max(count - 1, 0):]}
+        kept = {meta['source'] for meta in self.metadata[:count]}
+        lost.update(path for path in self.source_hashes if path not in kept)
+        for path in lost:
+            self.source_hashes.pop(path, None)
+        
+        self.documents = self.documents[:count]
+        self.metadata = self.metadata[:count]
+        self._persisted_count = 0
+        if self.index.ntotal > count:
+            self.index = self._build_index(self._index_vectors()[:count])
+            self._index_mmapped = False
+        print(f"⚠️ Index and metadata disagreed; kept {count} rows, will re-ingest: {', '.join(sorted(lost))}")
+        try:
+            self._save_faiss_index()
+        except (OSError, RuntimeError) as e:
+            print(f"⚠️ Could not save the repaired index: {e}")
+        return True
+    
+    def _migrate_legacy_metadata(self):
+        """Write metadata loaded from the legacy pickle as jsonl, so later starts skip the pickle"""
+        try:
+            # The index itself is unchanged and may be memory-mapped, so it is not rewritten
+            self._save_rows()
+            self._save_sources()
+            print(f"✅ Migrated {self.metadata_path} to jsonl")
+        except OSError as e:
+            print(f"⚠️ Could not migrate {self.metadata_path} to jsonl: {e}")
+    
+    def _read_index(self, writable: bool = False):
+        """Read the saved index, memory-mapped and read-only unless it is about to be modified
+        
+        Mapping lets searches fault in only the pages they touch instead of reading
+        the whole file at startup. Index types or FAISS builds that cannot map are
+        read normally.
+        """
+        index = None
+        self._index_mmapped = False
+        if not writable:
+            try:
+                index = faiss.read_index(self.index_path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+                self._index_mmapped = True
+            except (AttributeError, RuntimeError):
+                index = None
+        if index is None:
+            index = faiss.read_index(self.index_path)
+        if hasattr(index, 'hnsw'):
+            index.hnsw.efSearch = self.hnsw_ef_search
+        return index
+    
+    def _create_faiss_index(self, n_vectors: int = 0):
+        """Create an empty HNSW index (inner product == cosine) sized for n_vectors
+        
+        Large enough sets get int8 scalar-quantized storage, 384 bytes per vector
+        instead of 1536, which needs training before the first add; smaller ones
+        keep exact float vectors.
+        """
+        if n_vectors >= self.sq_min_train:
+            index = faiss.IndexHNSWSQ(
+                self.embedding_dim,
+                faiss.ScalarQuantizer.QT_8bit,
+                self.hnsw_m,
+                faiss.METRIC_INNER_PRODUCT
+            )
+        else:
+            index = faiss.IndexHNSWFlat(self.embedding_dim, self.hnsw_m, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = self.hnsw_ef_construction
+        index.hnsw.efSearch = self.hnsw_ef_search
+        return index
+    
+    def _build_index(self, vectors: np.ndarray):
+        """A new index holding vectors, trained on all of them when quantized"""
+        index = self._create_faiss_index(len(vectors))
+        if len(vectors):
+            if not index.is_trained:
+                index.train(vectors)
+            index.add(vectors)
+        return index
+    
+    def _index_vectors(self) -> np.ndarray:
+        """Float vectors of every indexed row
+        
+        A quantized index only decodes approximations, so its rows are taken from
+        the chunk embedding cache where present.
+        """
+        if self.index.ntotal == 0:
+            return np.empty((0, self.embedding_dim), dtype='float32')
+        vectors = self.index.reconstruct_n(0, self.index.ntotal)
+        if isinstance(self.index, faiss.IndexHNSWSQ):
+            keys = [self._chunk_key(chunk) for chunk in self.documents]
+            cached = self._load_chunk_embeddings(keys)
+            for i, key in enumerate(keys):
+                if key in cached:
+                    vectors[i] = np.frombuffer(cached[key], dtype='float32')
+        return vectors
+    
+    def _setup_embed_cache(self):
+        """Open the on-disk query and document chunk embedding caches"""
+        try:
+            self._embed_db = sqlite3.connect(self.embed_cache_path, check_same_thread=False)
+            self._embed_db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vec BLOB)"
+            )
+            # Keyed by SHA-256 of encoder id + chunk text, so re-ingesting only encodes new chunks
+            self._embed_db.execute(
+                "CREATE TABLE IF NOT EXISTS chunk_embeddings (key TEXT PRIMARY KEY, vec BLOB)"
+            )
+            self._embed_db.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️ Embedding cache disabled: {e}")
+            self._embed_db = None
+    
+    def _embedding_key(self, text: str):
+        """Normalize a query and derive its embedding cache key"""
+        # all-MiniLM-L6-v2 is uncased, so lowercasing does not change the embedding
+        text = ' '.join(text.lower().split())
+        # Include the encoder so FP32 and INT8 embeddings never mix in the on-disk cache
+        key = hashlib.sha256(f"{self.embedding_model_id}\0{text}".encode('utf-8')).hexdigest()
+        return text, key
+    
+    def _get_cached_embedding(self, key: str):
+        """Look a query embedding up in memory, then on disk; None on miss"""
+        embedding = self._memory_embedding(key)
+        if embedding is None:
+            embedding = self._disk_embedding(key)
+            if embedding is not None:
+                self._remember_embedding(key, embedding)
+        return embedding
+    
+    def _memory_embedding(self, key: str):
+        """Look a query embedding up in the in-memory LRU tier; None on miss"""
+        embedding = self._embed_cache.get(key)
+        if embedding is not None:
+            self._embed_cache.move_to_end(key)
+        return embedding
+    
+    def _disk_embedding(self, key: str):
+        """Look a query embedding up in the SQLite tier; None on miss"""
+        if self._embed_db is None:
+            return None
+        with self._embed_lock:
+            row = self._embed_db.execute(
+                "SELECT vec FROM embeddings WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return np.frombuffer(row[0], dtype='float32').reshape(1, -1).copy()
+    
+    def _remember_embedding(self, key: str, embedding: np.ndarray):
+        """Put an embedding in the in-memory LRU tier"""
+        self._embed_cache[key] = embedding
+        if len(self._embed_cache) > self.embed_cache_size:
+            self._embed_cache.popitem(last=False)
+    
+    def _store_embedding(self, key: str, embedding: np.ndarray):
+        """Put a freshly computed embedding in both cache tiers"""
+        self._remember_embedding(key, embedding)
+        self._persist_embeddings([(key, embedding.tobytes())])
+    
+    def _persist_embeddings(self, rows: List[Tuple[str, bytes]]):
+        """Write (key, vector bytes) rows to the SQLite tier in one transaction"""
+        if self._embed_db is None:
+            return
+        try:
+            with self._embed_lock:
+                self._embed_db.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vec) VALUES (?, ?)", rows
+                )
+                self._embed_db.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️ Could not persist query embedding: {e}")
+    
+    def _encode_queries(self, texts: List[str]) -> np.ndarray:
+        """Encode normalized queries into an (n, dim) float32 matrix of unit vectors"""
+        with torch.inference_mode():
+            embeddings = self.embedding_model.encode(
+                texts,
+                convert_to_numpy=True,
+                normalize_embeddings=True
+            )
+        return embeddings.astype('float32', copy=False)
+    
+    def _encode_query_rows(self, items: List[Tuple[str, str]]) -> List[np.ndarray]:
+        """Encode a batch of (text, key) queries into one (1, dim) embedding per query
+        
+        Runs in the batcher's executor thread, so the batch is also persisted here,
+        in a single transaction, rather than on the event loop.
+        """
+        embeddings = self._encode_queries([text for text, _ in items])
+        self._persist_embeddings([(key, embeddings[i].tobytes()) for i, (_, key) in enumerate(items)])
+        return [embeddings[i:i + 1] for i in range(len(items))]
+    
+    def _encode_cached(self, text: str) -> np.ndarray:
+        """Return the normalized float32 embedding of a query, encoding only on cache miss"""
+        text, key = self._embedding_key(text)
+        embedding = self._get_cached_embedding(key)
+        if embedding is None:
+            embedding = self._encode_queries([text])
+            self._store_embedding(key, embedding)
+        return embedding
+    
+    async def aencode_query(self, text: str) -> np.ndarray:
+        """Async _encode_cached: cache misses from concurrent callers share one batched encode
+        
+        Only the in-memory tier is touched on the event loop; SQLite reads and
+        writes (commit included) run in executor threads.
+        """
+        text, key = self._embedding_key(text)
+        embedding = self._memory_embedding(key)
+        if embedding is None:
+            loop = asyncio.get_running_loop()
+            embedding = await loop.run_in_executor(None, self._disk_embedding, key)
+            if embedding is None:
+                embedding = await self._encode_batcher.submit((text, key))
+            self._remember_embedding(key, embedding)
+        return embedding
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Summary of the indexed knowledge base, cached until documents are added"""
+        if self._stats_cache is None:
+            self._stats_cache = {
+                'total_documents': len(self.documents),
+                'unique_sources': len({meta['source'] for meta in self.metadata}),
+                'sample_sources': list(dict.fromkeys(meta['source_basename'] for meta in self.metadata[:5]))
+            }
+        return self._stats_cache
+    
+    @property
+    def document_count(self) -> int:
+        """Number of indexed chunks"""
+        return self.get_stats()['total_documents']
+    
+    @property
+    def unique_source_count(self) -> int:
+        """Number of distinct source files behind the indexed chunks"""
+        return self.get_stats()['unique_sources']
+    
+    @staticmethod
+    def _read_jsonl(path: str) -> Tuple[List, bool]:
+        """Stream one JSON value per line into a list, stopping at a line torn by a crash
+        
+        Returns the rows and whether the whole file was read.
+        """
+        rows = []
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    rows.append(json.loads(line))
+                except json.JSONDecodeError:
+                    return rows, False
+        return rows, True
+    
+    @staticmethod
+    def _replace_file(path: str, write):
+        """Produce path with write(tmp_path), then swap it in atomically with os.replace"""
+        tmp_path = path + ".tmp"
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    
     def _save_faiss_index(self):
-        """Save FAISS index and metadata"""
-        faiss.write_index(self.index, self.index_path)
-        with open(self.metadata_path, 'wb') as f:
-            pickle.dump({
-                'documents': self.documents,
-                'metadata': self.metadata
-            }, f)
+        """Save FAISS index and metadata
+        
+        Documents and metadata are append-only jsonl files, so a save normally
+        only appends the rows added since the last one; after rows were removed
+        they are rewritten whole. Full files are written to temporaries and
+        swapped in with os.replace. The order is rows, then index, then source
+        hashes: short of a crash between the back-to-back renames of a rewrite,
+        this leaves at worst surplus jsonl rows, which loading trims, and files
+        not yet recorded as indexed, which the next ingest redoes.
+        """
+        self._save_rows()
+        self._replace_file(self.index_path, lambda path: faiss.write_index(self.index, path))
+        self._save_sources()
+    
+    def _save_rows(self):
+        """Write the documents and metadata rows added since the last save"""
+        start = self._persisted_count
+        for path, rows in ((self.documents_path, self.documents),
+                           (self.chunk_metadata_path, self.metadata)):
+            def write(target, rows=rows, mode='a' if start else 'w'):
+                with open(target, mode, encoding='utf-8') as f:
+                    f.writelines(json.dumps(row, ensure_ascii=False) + "\n"
+                                 for row in itertools.islice(rows, start, None))
+            if start:
+                write(path)
+            else:
+                self._replace_file(path, write)
+        self._persisted_count = len(self.documents)
+    
+    def _save_sources(self):
+        """Record which file contents are indexed"""
+        def write(target):
+            with open(target, 'w', encoding='utf-8') as f:
+                json.dump(self.source_hashes, f)
+        self._replace_file(self.sources_path, write)
+    
+    def save(self):
+        """Persist the index and metadata"""
+        self._save_faiss_index()
     
     def chunk_text(self, text: str, chunk_size: int = 300, chunk_overlap: int = 50) -> List[str]:
         """Split text into chunks"""
         words = text.split()
-        chunks = []
+        n_words = len(words)
+        if not n_words:
+            return []
+        # Join once and slice each chunk out by character offset instead of re-joining
+        # overlapping word windows; starts[k] is where word k begins in joined
+        joined = ' '.join(words)
+        starts = list(itertools.accumulate((len(word) + 1 for word in words), initial=0))
         
-        for i in range(0, len(words), chunk_size - chunk_overlap):
-            chunk = ' '.join(words[i:i + chunk_size])
-            chunks.append(chunk)
-            if i + chunk_size >= len(words):
-                break
-                
-        return chunks
+        # Window starts stop once a window reaches the end; a start within the last
+        # chunk_overlap words would only repeat the tail of the previous window
+        return [
+            joined[starts[i]:starts[min(i + chunk_size, n_words)] - 1]
+            for i in range(0, max(1, n_words - chunk_overlap), chunk_size - chunk_overlap)
+        ]
     
     def add_documents(self, file_path: str):
         """Add documents to the knowledge base"""
-        import PyPDF2
-        import docx
-        
         print(f"📄 Processing document: {file_path}")
+        self.add_text(file_path, extract_text(file_path))
+    
+    def add_text(self, file_path: str, text: str, save: bool = True) -> int:
+        """Chunk, embed and index text already extracted from file_path
         
-        text = ""
-        if file_path.endswith('.pdf'):
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-        elif file_path.endswith('.txt'):
-            with open(file_path, 'r', encoding='utf-8') as file:
-                text = file.read()
-        elif file_path.endswith('.docx'):
-            doc = docx.Document(file_path)
-            text = '\n'.join([paragraph.text for paragraph in doc.paragraphs])
-        
-        if not text.strip():
-            print(f"❌ No text extracted from {file_path}")
-            return
+        Returns the number of chunks added. Pass save=False to defer writing the
+        index and metadata to a later save() call.
+        """
+        return self.add_texts_bulk([(file_path, text)], save=save)
+    
+    def add_texts_bulk(self, items: List[Tuple[str, str]], save: bool = True) -> int:
+        """Index several (file_path, text) documents with one encode, one index.add and one save
         
-        chunks = self.chunk_text(text)
-        new_documents = []
-        new_metadata = []
+        Returns the number of chunks added.
+        """
+        prepared = []  # (file_path, text_hash, original_length, kept chunks)
+        # A path listed twice is indexed once, with its last text
+        for file_path, text in dict(items).items():
+            if not text.strip():
+                print(f"❌ No text extracted from {file_path}")
+                continue
+            
+            # Skip re-embedding documents whose content is already in the saved index under
+            # the current encoder; switching encoders (e.g. to the ONNX export) re-ingests
+            text_hash = hashlib.sha256(f"{self.embedding_model_id}\0{text}".encode('utf-8')).hexdigest()
+            if self.source_hashes.get(file_path) == text_hash:
+                print(f"⏭️ {file_path} is unchanged since it was indexed, skipping")
+                continue
+            
+            chunks = self.chunk_text(text)
+            
+            # Keep only meaningful chunks, remembering their position in the document.
+            # chunk_text output has no surrounding whitespace, so len needs no strip();
+            # tolist() keeps chunk ids plain ints for the jsonl metadata
+            lengths = np.fromiter(map(len, chunks), dtype=np.int64, count=len(chunks))
+            kept = [(i, chunks[i]) for i in np.flatnonzero(lengths > 50).tolist()]
+            if not kept:
+                print(f"❌ No meaningful chunks in {file_path}")
+                continue
+            prepared.append((file_path, text_hash, len(text), kept))
         
-        for i, chunk in enumerate(chunks):
-            if len(chunk.strip()) > 50:
-                try:
-                    embedding = self.embedding_model.encode([chunk])
-                    embedding = embedding.astype('float32')
-                    faiss.normalize_L2(embedding)
-                    
-                    self.index.add(embedding)
-                    new_documents.append(chunk)
-                    new_metadata.append({
-                        "source": file_path,
-                        "chunk_id": i,
-                        "original_length": len(text)
-                    })
-                except Exception as e:
-                    continue
+        if not prepared:
+            return 0
+        
+        new_documents = [chunk for *_, kept in prepared for _, chunk in kept]
+        try:
+            embeddings = self._embed_chunks(new_documents)
+        except Exception as e:
+            print(f"❌ Failed to embed chunks from {', '.join(path for path, *_ in prepared)}: {e}")
+            return 0
+        
+        if self._index_mmapped:
+            # A mapped index is read-only; load it fully before adding to it
+            self.index = self._read_index(writable=True)
+        
+        # Indexed rows, not source_hashes, decide: a save interrupted before the
+        # hashes were written leaves rows for files with no recorded hash
+        indexed_sources = {meta['source'] for meta in self.metadata}
+        replaced = {file_path for file_path, *_ in prepared if file_path in indexed_sources}
+        for file_path in replaced:
+            print(f"♻️ {file_path} changed since it was indexed, replacing its old chunks")
+        
+        if replaced:
+            # HNSW cannot remove_ids, so drop every replaced file's rows at once and
+            # rebuild a single time from the exact vectors left plus the new ones
+            self.index = self._build_index(np.vstack([self._remove_sources(replaced), embeddings]))
+        elif (not isinstance(self.index, faiss.IndexHNSWSQ)
+                and self.index.ntotal + len(embeddings) >= self.sq_min_train):
+            # Enough vectors to learn the scalar quantizer's ranges: rebuild quantized,
+            # trained on every exact vector rather than on this batch alone
+            self.index = self._build_index(np.vstack([self._index_vectors(), embeddings]))
+        else:
+            # A quantized index was already trained on at least sq_min_train vectors
+            self.index.add(embeddings)
+        
+        for file_path, text_hash, original_length, kept in prepared:
+            source_basename = os.path.basename(file_path)
+            self.metadata.extend(
+                {
+                    "source": file_path,
+                    "source_basename": source_basename,
+                    "chunk_id": i,
+                    "original_length": original_length
+                }
+                for i, _ in kept
+            )
+            self.source_hashes[file_path] = text_hash
+            print(f"✅ Added {len(kept)} chunks from {file_path}")
+        self.documents.extend(new_documents)
         
-        if new_documents:
-            self.documents.extend(new_documents)
-            self.metadata.extend(new_metadata)
+        if save:
             self._save_faiss_index()
-            print(f"✅ Added {len(new_documents)} chunks from {file_path}")
+        # Cached stats and search results no longer reflect the knowledge base
+        self._stats_cache = None
+        with self._result_cache_lock:
+            self._result_cache.clear()
+        return len(new_documents)
+    
+    def _chunk_key(self, chunk: str) -> str:
+        """chunk_embeddings cache key: SHA-256 of encoder id + chunk text"""
+        return hashlib.sha256(f"{self.embedding_model_id}\0{chunk}".encode('utf-8')).hexdigest()
+    
+    def _embed_chunks(self, chunks: List[str]) -> np.ndarray:
+        """Embed document chunks, encoding only those not cached on disk by an earlier ingest"""
+        keys = [self._chunk_key(chunk) for chunk in chunks]
+        cached = self._load_chunk_embeddings(keys)
+        missing = [i for i, key in enumerate(keys) if key not in cached]
+        
+        embeddings = np.empty((len(chunks), self.embedding_dim), dtype='float32')
+        for i, key in enumerate(keys):
+            if key in cached:
+                embeddings[i] = np.frombuffer(cached[key], dtype='float32')
+        
+        if missing:
+            # Larger batches for large documents so each forward pass keeps all cores busy
+            batch_size = max(32, min(256, len(missing) // (os.cpu_count() or 1)))
+            # Single batched encode: SentenceTransformer length-sorts the batch internally
+            # to minimise padding, and normalize_embeddings replaces faiss.normalize_L2
+            with torch.inference_mode():
+                fresh = self.embedding_model.encode(
+                    [chunks[i] for i in missing],
+                    batch_size=batch_size,
+                    show_progress_bar=False,
+                    convert_to_numpy=True,
+                    normalize_embeddings=True
+                ).astype('float32', copy=False)
+            embeddings[missing] = fresh
+            self._save_chunk_embeddings([(keys[i], fresh[j].tobytes()) for j, i in enumerate(missing)])
+        
+        if cached:
+            print(f"♻️ Reused {len(chunks) - len(missing)} cached chunk embeddings")
+        return embeddings
+    
+    def _load_chunk_embeddings(self, keys: List[str]) -> Dict[str, bytes]:
+        """Fetch cached chunk vectors by key; an empty dict if the cache is unavailable"""
+        if self._embed_db is None:
+            return {}
+        found = {}
+        try:
+            with self._embed_lock:
+                # Stay under SQLite's default limit on bound parameters
+                for start in range(0, len(keys), 500):
+                    batch = keys[start:start + 500]
+                    rows = self._embed_db.execute(
+                        f"SELECT key, vec FROM chunk_embeddings WHERE key IN ({','.join('?' * len(batch))})",
+                        batch
+                    )
+                    found.update(rows)
+        except sqlite3.Error as e:
+            print(f"⚠️ Could not read chunk embedding cache: {e}")
+        return found
+    
+    def _save_chunk_embeddings(self, rows: List[Tuple[str, bytes]]):
+        """Persist freshly computed chunk vectors"""
+        if self._embed_db is None:
+            return
+        try:
+            with self._embed_lock:
+                self._embed_db.executemany(
+                    "INSERT OR REPLACE INTO chunk_embeddings (key, vec) VALUES (?, ?)", rows
+                )
+                self._embed_db.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️ Could not persist chunk embeddings: {e}")
+    
+    def _remove_sources(self, file_paths) -> np.ndarray:
+        """Drop every row that came from file_paths; returns the exact vectors of the rest
+        
+        The index still holds the old rows, so the caller must rebuild it from the
+        returned vectors (retraining any quantizer); no chunk text is re-encoded.
+        """
+        keep = [i for i, meta in enumerate(self.metadata) if meta['source'] not in file_paths]
+        vectors = self._index_vectors()[keep]
+        self.documents = [self.documents[i] for i in keep]
+        self.metadata = [self.metadata[i] for i in keep]
+        for file_path in file_paths:
+            self.source_hashes.pop(file_path, None)
+        # Rows shifted, so the next save rewrites the jsonl files
+        self._persisted_count = 0
+        return vectors
     
     def search_similar(self, query: str, n_results: int = 3) -> List[Dict]:
         """Search for similar documents"""
@@ -192,45 +845,94 @@ class EnhancedRAGPipeline:
             return []
         
         try:
-            query_embedding = self.embedding_model.encode([query])
-            query_embedding = query_embedding.astype('float32')
-            faiss.normalize_L2(query_embedding)
-            
-            distances, indices = self.index.search(query_embedding, min(n_results, len(self.documents)))
-            
+            return self.search_by_embedding(self._encode_cached(query), n_results)
+        except Exception as e:
+            print(f"❌ Error in search_similar: {e}")
+            return []
+    
+    def search_by_embedding(self, query_embedding: np.ndarray, n_results: int = 3) -> List[Dict]:
+        """Search for documents similar to an already-encoded query"""
+        results = self._cached_results(query_embedding, n_results)
+        if results is None:
+            results = self._search_batch([(query_embedding, n_results)])[0]
+            self._cache_results(query_embedding, n_results, results)
+        return results
+    
+    async def asearch_by_embedding(self, query_embedding: np.ndarray, n_results: int = 3) -> List[Dict]:
+        """Async search_by_embedding; concurrent searches share one FAISS call"""
+        results = self._cached_results(query_embedding, n_results)
+        if results is None:
+            results = await self._search_batcher.submit((query_embedding, n_results))
+            self._cache_results(query_embedding, n_results, results)
+        return results
+    
+    def _cached_results(self, query_embedding: np.ndarray, n_results: int):
+        """Results stored for a near-identical query that asked for at least n_results; None on miss"""
+        with self._result_cache_lock:
+            cached = self._result_cache.lookup(query_embedding)
+        if cached is None or cached[0] < n_results:
+            return None
+        return cached[1][:n_results]
+    
+    def _cache_results(self, query_embedding: np.ndarray, n_results: int, results: List[Dict]):
+        """Remember a query's search results until the knowledge base changes"""
+        if results:
+            with self._result_cache_lock:
+                self._result_cache.add(query_embedding, (n_results, results))
+    
+    def _search_batch(self, requests: List[tuple]) -> List[List[Dict]]:
+        """Run (query_embedding, n_results) requests through a single FAISS search"""
+        if len(self.documents) == 0:
+            return [[] for _ in requests]
+        
+        queries = np.vstack([query_embedding for query_embedding, _ in requests])
+        k = min(max(n_results for _, n_results in requests), len(self.documents))
+        distances, indices = self.index.search(queries, k)
+        
+        # documents/metadata are parallel lists in FAISS row order
+        documents = self.documents
+        metadata = self.metadata
+        n_docs = len(documents)
+        
+        # FAISS returns each row best-first (descending inner product), so no re-sort is needed
+        batch_results = []
+        for row, (_, n_results) in enumerate(requests):
             formatted_results = []
-            for i, idx in enumerate(indices[0]):
-                if 0 <= idx < len(self.documents):
+            for score, idx in zip(distances[row, :n_results].tolist(), indices[row, :n_results].tolist()):
+                if 0 <= idx < n_docs:
+                    meta = metadata[idx]
                     formatted_results.append({
-                        'content': self.documents[idx],
-                        'source': self.metadata[idx]['source'],
-                        'chunk_id': self.metadata[idx]['chunk_id'],
-                        'similarity_score': float(distances[0][i])
+                        'content': documents[idx],
+                        'source': meta['source'],
+                        'source_basename': meta['source_basename'],
+                        'chunk_id': meta['chunk_id'],
+                        'similarity_score': score
                     })
             
-            formatted_results.sort(key=lambda x: x['similarity_score'], reverse=True)
-            return formatted_results
-            
-        except Exception as e:
-            print(f"❌ Error in search_similar: {e}")
-            return []
+            batch_results.append(formatted_results)
+        return batch_results
+    
+    def generate_response(self, query: str, context: List[Dict]) -> Tuple[str, List[str]]:
+        """Generate a response with RAG context, returned with the deduplicated source file names"""
+        source_files = list(dict.fromkeys(item['source_basename'] for item in context))
+        return self._generate_text(query, context), source_files
     
-    def generate_response(self, query: str, context: List[Dict]) -> str:
+    def _generate_text(self, query: str, context: List[Dict]) -> str:
         """Generate response using the LLM with RAG context"""
         if not context:
             return "I couldn't find relevant information in my knowledge base to answer your question."
         
         try:
             # Prepare context from retrieved documents
-            context_text = ""
+            context_parts = []
             for i, item in enumerate(context[:2]):  # Use top 2 documents
+                # Chunks are already whitespace-normalized by chunk_text at ingest time
                 content = item['content']
-                # Clean up the content
-                content = ' '.join(content.split())  # Remove extra whitespace
                 # Truncate if too long
                 if len(content) > 400:
                     content = content[:400] + "..."
-                context_text += f"Source {i+1}: {content}\n\n"
+                context_parts.append(f"Source {i+1}: {content}\n\n")
+            context_text = "".join(context_parts)
             
             # Create a more conversational prompt that encourages response
             prompt = f"""Here is some information from documents:
@@ -243,36 +945,29 @@ Answer:"""
             print(f"📝 PROMPT LENGTH: {len(prompt)} characters")
             print(f"📝 CONTEXT DOCUMENTS: {len(context)}")
             
-            # Generate response with different parameters
-            outputs = self.generator(
-                prompt,
-                max_new_tokens=200,
-                temperature=0.8,
-                do_sample=True,
-                top_p=0.9,
-                repetition_penalty=1.1,
-                pad_token_id=self.tokenizer.eos_token_id,
-                num_return_sequences=1
-            )
+            self._ensure_llm()
+            # Sampling parameters come from the model's generation config (_configure_generation)
+            outputs = self.generator(prompt)
             
             response = outputs[0]['generated_text']
             
             print(f"🔍 RAW GENERATED TEXT: '{response}'")
             
-            # Try different extraction methods
-            if prompt in response:
-                extracted = response.split(prompt)[-1].strip()
-                print(f"✅ EXTRACTED VIA PROMPT SPLIT: '{extracted}'")
+            # Try different extraction methods; both generators echo the prompt first,
+            # so slicing it off avoids searching the whole output for it
+            if response.startswith(prompt):
+                extracted = response[len(prompt):].strip()
+                print(f"✅ EXTRACTED VIA PROMPT SLICE: '{extracted}'")
                 response = extracted
             elif "Answer:" in response:
-                extracted = response.split("Answer:")[-1].strip()
+                extracted = response.rpartition("Answer:")[2].strip()
                 print(f"✅ EXTRACTED VIA ANSWER SPLIT: '{extracted}'")
                 response = extracted
             else:
                 print(f"⚠️ USING FULL RESPONSE: '{response}'")
             
-            # Clean up response
-            response = response.split('\n')[0] if '\n' in response else response
+            # Clean up response: keep the first line only
+            response = response.partition('\n')[0]
             
             # If response is still empty or too short, use fallback
             if not response or len(response.strip()) < 20:
@@ -310,7 +1005,25 @@ Answer:"""
                 return f"Based on Baguio City ordinances: {' '.join(summary_parts)}"
             return "I found traffic regulation information but couldn't generate a detailed response."
 
-# Initialize the pipeline
-print("🚀 Starting enhanced RAG pipeline...")
-rag_pipeline = EnhancedRAGPipeline()
-print("✅ Enhanced RAG pipeline ready!")
\ No newline at end of file
+@functools.lru_cache(maxsize=None)
+def get_rag_pipeline() -> EnhancedRAGPipeline:
+    """Return the process-wide pipeline, loading models and the index on first use"""
+    print("🚀 Starting enhanced RAG pipeline...")
+    instance = EnhancedRAGPipeline()
+    print("✅ Enhanced RAG pipeline ready!")
+    return instance
+
+
+class _LazyPipeline:
+    """Module-level stand-in that builds the shared pipeline on first attribute access"""
+    
+    def __getattr__(self, name):
+        return getattr(get_rag_pipeline(), name)
+
+
+# Public compatibility surface: this module used to build `rag_pipeline` at import
+# time, and scripts outside this package may still do
+# `from actions.rag_pipeline import rag_pipeline`. The proxy keeps that import
+# working without loading models until an attribute is used. Code in this repo
+# calls get_rag_pipeline() (through actions._rag_singleton for the actions).
+rag_pipeline = _LazyPipeline()
@@ -0,0 +1,77 @@
+"""Answer cache keyed by query embedding similarity."""
+import time
+from typing import Any, Optional
+
+import numpy as np
+
+
+class SemanticCache:
+    """Return a stored answer when a new query is a near-duplicate of a cached one.
+    
+    Embeddings must be L2-normalized so the dot product is cosine similarity.
+    Entries older than ttl seconds (if set) never match; once capacity is
+    reached the least recently used entry is replaced.
+    
+    Every lookup scores all entries: an int8 scan of a thousand 384-dim rows
+    takes microseconds, while a missed hit costs a full generation, so no
+    approximate candidate search is worth its lost recall at this size.
+    
+    Vectors are stored as int8 with one float32 scale per entry, a quarter of
+    the float32 footprint; similarities are accumulated in int32 and rescaled.
+    """
+    
+    def __init__(self, dim: int = 384, capacity: int = 1024, threshold: float = 0.95,
+                 ttl: Optional[float] = None):
+        self.capacity = capacity
+        self.threshold = threshold
+        self.ttl = ttl
+        self.codes = np.zeros((capacity, dim), dtype=np.int8)
+        self.scales = np.zeros(capacity, dtype='float32')
+        self.payloads = [None] * capacity
+        self.created = np.zeros(capacity)
+        self.last_used = np.zeros(capacity)
+        self.size = 0
+    
+    @staticmethod
+    def _quantize(vector: np.ndarray):
+        """Symmetric int8 codes and the scale that maps them back to the vector"""
+        scale = float(np.max(np.abs(vector))) / 127 or 1.0
+        return np.round(vector / scale).astype(np.int8), scale
+    
+    def lookup(self, query_embedding: np.ndarray) -> Optional[Any]:
+        """Return the payload of the most similar live entry above threshold, or None"""
+        if self.size == 0:
+            return None
+        
+        now = time.monotonic()
+        codes, scale = self._quantize(query_embedding.reshape(-1))
+        # int8 products would overflow, so accumulate in int32
+        raw = self.codes[:self.size].astype(np.int32) @ codes.astype(np.int32)
+        sims = raw * (self.scales[:self.size] * scale)
+        if self.ttl:
+            sims[now - self.created[:self.size] > self.ttl] = -np.inf
+        
+        best = int(np.argmax(sims))
+        if sims[best] < self.threshold:
+            return None
+        self.last_used[best] = now
+        return self.payloads[best]
+    
+    def add(self, query_embedding: np.ndarray, payload: Any):
+        """Cache payload under query_embedding, evicting the least recently used entry if full"""
+        now = time.monotonic()
+        if self.size < self.capacity:
+            row = self.size
+            self.size += 1
+        else:
+            row = int(np.argmin(self.last_used))
+        
+        self.codes[row], self.scales[row] = self._quantize(query_embedding.reshape(-1))
+        self.payloads[row] = payload
+        self.created[row] = now
+        self.last_used[row] = now
+    
+    def clear(self):
+        """Forget every entry"""
+        self.payloads = [None] * self.capacity
+        self.size = 0
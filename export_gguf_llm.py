@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+import os
+import subprocess
+import sys
+import tempfile
+from transformers import AutoModelForCausalLM, AutoTokenizer
+
+MODEL_NAME = "microsoft/DialoGPT-medium"
+OUTPUT_PATH = "vector_db/dialogpt-medium-q4_0.gguf"
+# Checkout of https://github.com/ggerganov/llama.cpp with llama-quantize built
+LLAMA_CPP_DIR = os.environ.get("LLAMA_CPP_DIR", "llama.cpp")
+
+def export_gguf_llm():
+    """Convert the LLM to GGUF and quantize it to 4 bits for llama.cpp in the RAG pipeline"""
+    converter = os.path.join(LLAMA_CPP_DIR, "convert_hf_to_gguf.py")
+    quantizer = os.path.join(LLAMA_CPP_DIR, "build", "bin", "llama-quantize")
+    for tool in (converter, quantizer):
+        if not os.path.exists(tool):
+            sys.exit(f"❌ {tool} not found; set LLAMA_CPP_DIR to a built llama.cpp checkout")
+    
+    with tempfile.TemporaryDirectory() as work_dir:
+        print(f"📥 Saving {MODEL_NAME} for conversion...")
+        model_dir = os.path.join(work_dir, "model")
+        AutoModelForCausalLM.from_pretrained(MODEL_NAME).save_pretrained(model_dir)
+        AutoTokenizer.from_pretrained(MODEL_NAME).save_pretrained(model_dir)
+        
+        print("🔄 Converting to GGUF (f16)...")
+        f16_path = os.path.join(work_dir, "model-f16.gguf")
+        subprocess.run(
+            [sys.executable, converter, model_dir, "--outfile", f16_path, "--outtype", "f16"],
+            check=True
+        )
+        
+        print("🧮 Quantizing weights to Q4_0...")
+        os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
+        subprocess.run([quantizer, f16_path, OUTPUT_PATH, "q4_0"], check=True)
+    
+    print(f"✅ Quantized LLM saved to {OUTPUT_PATH}")
+    print("Install llama-cpp-python (pip install llama-cpp-python) and restart the action server to use it.")
+
+if __name__ == "__main__":
+    export_gguf_llm()
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+import os
+from optimum.onnxruntime import ORTModelForFeatureExtraction
+from onnxruntime.quantization import quantize_dynamic, QuantType
+from transformers import AutoTokenizer
+
+MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+OUTPUT_DIR = "vector_db/minilm_onnx"
+
+def export_onnx_encoder():
+    """Export the embedding model to ONNX and quantize it to INT8 for the RAG pipeline"""
+    print(f"📥 Exporting {MODEL_NAME} to ONNX...")
+    model = ORTModelForFeatureExtraction.from_pretrained(MODEL_NAME, export=True)
+    model.save_pretrained(OUTPUT_DIR)
+    AutoTokenizer.from_pretrained(MODEL_NAME).save_pretrained(OUTPUT_DIR)
+    
+    print("🧮 Quantizing weights to INT8...")
+    quantize_dynamic(
+        os.path.join(OUTPUT_DIR, "model.onnx"),
+        os.path.join(OUTPUT_DIR, "model_quantized.onnx"),
+        weight_type=QuantType.QInt8
+    )
+    
+    print(f"✅ INT8 encoder saved to {OUTPUT_DIR}")
+    print("Rebuild the knowledge base (python setup_knowledge_base.py) so stored vectors match the new encoder.")
+
+if __name__ == "__main__":
+    export_onnx_encoder()
@@ -4,11 +4,11 @@ download_and_inspect_leetcode_dataset.py
 
 This script:
  - Downloads the cassanof/leetcode-solutions dataset from Hugging Face
- - Saves it locally as leetcode_solutions.jsonl
+ - Saves it locally as leetcode_solutions.parquet
  - Prints the first 5 entries (dataset head)
 
 Requirements:
-    pip install datasets pandas
+    pip install datasets pandas pyarrow
 """
 
 from datasets import load_dataset
@@ -18,7 +18,7 @@ import pandas as pd
 # CONFIGURATION
 # ---------------------------------------------------------
 DATASET_NAME = "cassanof/leetcode-solutions"
-OUTPUT_FILE = "leetcode_solutions.jsonl"
+OUTPUT_FILE = "leetcode_solutions.parquet"
 NUM_HEAD = 5  # how many records to preview
 # ---------------------------------------------------------
 
@@ -31,8 +31,8 @@ try:
     print(f"✅ Dataset loaded successfully with {len(ds)} records.")
     print(f"💾 Saving to local file: {OUTPUT_FILE}")
 
-    # Save dataset locally (JSONL format — 1 JSON object per line)
-    ds.to_json(OUTPUT_FILE, orient="records", lines=True)
+    # Save dataset locally (Parquet — columnar and compressed, far smaller and faster to re-read than JSONL)
+    ds.to_parquet(OUTPUT_FILE)
     print(f"🎯 Saved dataset to '{OUTPUT_FILE}'")
 
     # Convert small slice to DataFrame for easy inspection
@@ -42,7 +42,7 @@ try:
 
     print("\n✅ Inspection complete. You can explore further by running:")
     print("  import pandas as pd")
-    print(f"  df = pd.read_json('{OUTPUT_FILE}', lines=True)")
+    print(f"  df = pd.read_parquet('{OUTPUT_FILE}')")
     print("  print(df.head())")
 
 except Exception as e:
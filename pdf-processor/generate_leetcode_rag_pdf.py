@@ -20,6 +20,7 @@ Options can be modified in the CONFIG section.
 import os
 import sys
 import argparse
+import itertools
 from typing import Optional
 
 # Try importing libraries and provide helpful errors
@@ -41,6 +42,12 @@ except Exception as e:
     md_lib = None
     _markdown_err = e
 
+# pyarrow is only needed to read a local Parquet dump
+try:
+    import pyarrow.parquet as pq
+except Exception:
+    pq = None
+
 # WeasyPrint is optional
 try:
     from weasyprint import HTML
@@ -51,6 +58,7 @@ except Exception:
 
 # ----------------- CONFIG -----------------
 DATASET_NAME = "cassanof/leetcode-solutions"
+LOCAL_DUMP = "leetcode_solutions.parquet"  # written by download_leetcode_dataset.py
 OUTPUT_MD = "leetcode_solutions_rag.md"
 OUTPUT_PDF = "leetcode_solutions_rag.pdf"
 MAX_PROBLEMS = 500  # None for all
@@ -77,6 +85,31 @@ SAMPLE_DATA = [
 ]
 
 
+ENTRY_TEMPLATE = """---
+# Problem {number}: {title}
+# Difficulty: {difficulty}
+# Language: {language}
+# Tags: {tags}
+
+## 🧩 Problem Overview
+**Title:** {title}
+*Note: Original full problem text omitted for licensing reasons.*
+
+## 💡 Solution ({language})
+```{safe_lang}
+{solution}
+```
+
+## 🧠 Explanation
+{explanation}
+
+## ⚙️ Complexity
+Time Complexity: Not specified
+Space Complexity: Not specified
+---
+"""
+
+
 def make_markdown(entry: dict, index: int) -> str:
     """Safely format one dataset record as Markdown."""
     title = entry.get("title") or f"Problem {index+1}"
@@ -94,40 +127,23 @@ def make_markdown(entry: dict, index: int) -> str:
     solution = entry.get("solution") or ""
     explanation = entry.get("explanation") or "No explanation provided."
 
-    md = []
-    md.append("---")
-    md.append(f"# Problem {index+1}: {title}")
-    md.append(f"# Difficulty: {difficulty}")
-    md.append(f"# Language: {language}")
-    md.append(f"# Tags: {tags_str}")
-    md.append("")
-    md.append("## 🧩 Problem Overview")
-    md.append(f"**Title:** {title}")
-    md.append("*Note: Original full problem text omitted for licensing reasons.*")
-    md.append("")
-    md.append(f"## 💡 Solution ({language})")
-    md.append(f"```{safe_lang}")
-    md.append(solution)
-    md.append("```")
-    md.append("")
-    md.append("## 🧠 Explanation")
-    md.append(explanation)
-    md.append("")
-    md.append("## ⚙️ Complexity")
-    md.append("Time Complexity: Not specified")
-    md.append("Space Complexity: Not specified")
-    md.append("---")
-    md.append("")
-    return "\n".join(md)
+    return ENTRY_TEMPLATE.format(
+        number=index + 1,
+        title=title,
+        difficulty=difficulty,
+        language=language,
+        tags=tags_str,
+        safe_lang=safe_lang,
+        solution=solution,
+        explanation=explanation,
+    )
 
 
 def save_markdown(markdown_blocks, output_path: str):
     header = "# LeetCode Solutions (RAG-Ready)\n\n"
     header += "Structured LeetCode solutions suitable for RAG ingestion. Each entry includes metadata, code, and explanation.\n\n"
     with open(output_path, "w", encoding="utf-8") as f:
-        f.write(header)
-        for block in markdown_blocks:
-            f.write(block)
+        f.write(header + "".join(markdown_blocks))
     print(f"✅ Markdown saved to: {output_path}")
 
 
@@ -148,49 +164,69 @@ def convert_md_to_pdf(md_path: str, pdf_path: str):
     print(f"✅ PDF written to: {pdf_path}")
 
 
+RECORD_FIELDS = ["title", "difficulty", "language", "tags", "solution", "explanation"]
+
+
+def load_fallback_dataset(max_problems: Optional[int] = None):
+    """Up to max_problems records (all if None) from the local Parquet dump if present, else the built-in sample."""
+    if pq is not None and os.path.exists(LOCAL_DUMP):
+        try:
+            # read only the fields make_markdown uses, one row group at a time, and
+            # stop once enough records are in hand
+            dump = pq.ParquetFile(LOCAL_DUMP)
+            columns = [name for name in RECORD_FIELDS if name in dump.schema_arrow.names]
+            # to_pylist keeps lists and nulls as Python lists and None, like `datasets`
+            # records (pandas would give numpy arrays and NaN)
+            rows = (row for batch in dump.iter_batches(columns=columns) for row in batch.to_pylist())
+            records = list(itertools.islice(rows, max_problems))
+            print(f"✅ Loaded {len(records)} records from local dump: {LOCAL_DUMP}")
+            return records
+        except Exception as e:
+            print(f"⚠️ Failed to read {LOCAL_DUMP}:", e)
+    print("   Falling back to local sample dataset.")
+    return SAMPLE_DATA
+
+
+def build_markdown_blocks(dataset, max_problems: Optional[int]):
+    """Render the first max_problems records (all if None) of a list or streamed dataset."""
+    # None streams every record; the length of a stream is unknown
+    total = max_problems
+    if isinstance(dataset, list):
+        total = len(dataset) if total is None else min(total, len(dataset))
+    entries = itertools.islice(dataset, total)
+    if tqdm is not None:
+        entries = tqdm(entries, total=total, unit="entry")
+    return [make_markdown(entry, i) for i, entry in enumerate(entries)]
+
+
 def main(max_problems: Optional[int], generate_pdf: bool):
     # check for dependencies
     if load_dataset is None:
         print("⚠️ Hugging Face `datasets` library is not available.")
         print("   Install with: pip install datasets")
         print(f"   (error was: {_load_dataset_err})")
-        print("   Falling back to local sample dataset.")
-        dataset = SAMPLE_DATA
+        dataset = load_fallback_dataset(max_problems)
     else:
         # attempt to load dataset (with error handling)
         try:
             print(f"📥 Loading dataset '{DATASET_NAME}' from Hugging Face...")
-            dataset = load_dataset(DATASET_NAME, split="train")
-            print(f"✅ Dataset loaded, total records: {len(dataset)}")
+            # stream records so only the ones rendered are downloaded and parsed
+            dataset = load_dataset(DATASET_NAME, split="train", streaming=True)
+            print("✅ Dataset stream opened")
         except Exception as e:
             print("⚠️ Failed to download/load dataset from Hugging Face:", e)
-            print("   Falling back to local sample dataset.")
-            dataset = SAMPLE_DATA
-
-    # apply max_problems if requested
-    total = len(dataset)
-    if max_problems is not None:
-        total = min(total, max_problems)
+            dataset = load_fallback_dataset(max_problems)
 
     # build markdown blocks
-    markdown_blocks = []
     print("🧱 Building Markdown entries...")
-    if tqdm is None:
-        # simple loop with no progress bar
-        for i in range(total):
-            try:
-                entry = dataset[i]
-            except Exception:
-                # dataset might be plain list (SAMPLE_DATA)
-                entry = dataset[i]
-            markdown_blocks.append(make_markdown(entry, i))
-    else:
-        for i in tqdm(range(total), unit="entry"):
-            try:
-                entry = dataset[i]
-            except Exception:
-                entry = dataset[i]
-            markdown_blocks.append(make_markdown(entry, i))
+    try:
+        markdown_blocks = build_markdown_blocks(dataset, max_problems)
+    except Exception as e:
+        # a streamed dataset downloads and parses lazily, so errors surface here
+        if isinstance(dataset, list):
+            raise
+        print("⚠️ Failed while streaming dataset from Hugging Face:", e)
+        markdown_blocks = build_markdown_blocks(load_fallback_dataset(max_problems), max_problems)
 
     # save markdown
     save_markdown(markdown_blocks, OUTPUT_MD)
@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 import os
 import glob
-from actions.rag_pipeline import rag_pipeline  # ✅ import the instance, not the module
+from concurrent.futures import ProcessPoolExecutor
+from actions.document_loader import extract_text
 
 def setup_knowledge_base():
     """Initialize the knowledge base with documents using FAISS"""
@@ -26,8 +27,18 @@ def setup_knowledge_base():
     
     print(f"Found {len(documents)} documents to process...")
     
-    for doc_path in documents:
-        rag_pipeline.add_documents(doc_path)
+    # Text extraction is CPU-bound and independent per file, so run it across cores
+    print("📄 Extracting text...")
+    with ProcessPoolExecutor(max_workers=min(len(documents), os.cpu_count() or 1)) as executor:
+        texts = list(executor.map(extract_text, documents))
+    
+    # Imported only now: spawned workers re-import this module, and must not load
+    # torch, the models or FAISS just to extract text
+    from actions.rag_pipeline import get_rag_pipeline
+    
+    # One batched encode, one index add and one save for the whole batch
+    rag_pipeline = get_rag_pipeline()
+    rag_pipeline.add_texts_bulk(list(zip(documents, texts)))
     
     print("FAISS knowledge base setup complete!")
     print(f"Total documents in index: {len(rag_pipeline.documents)}")
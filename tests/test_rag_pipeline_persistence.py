@@ -0,0 +1,98 @@
+import hashlib
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("faiss")
+pytest.importorskip("torch")
+pytest.importorskip("sentence_transformers")
+pytest.importorskip("transformers")
+
+from actions.rag_pipeline import EnhancedRAGPipeline
+
+
+class _HashingEncoder:
+    """Deterministic bag-of-words encoder standing in for MiniLM"""
+    
+    max_seq_length = 256
+    
+    def encode(self, sentences, normalize_embeddings=False, **kwargs):
+        out = np.zeros((len(sentences), 384), dtype='float32')
+        for row, sentence in enumerate(sentences):
+            for word in sentence.split():
+                seed = int(hashlib.md5(word.encode('utf-8')).hexdigest()[:8], 16)
+                out[row] += np.random.default_rng(seed).standard_normal(384).astype('float32')
+        if normalize_embeddings:
+            out /= np.clip(np.linalg.norm(out, axis=1, keepdims=True), 1e-12, None)
+        return out
+
+
+@pytest.fixture
+def make_pipeline(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    
+    def setup_embedding_model(self):
+        self.embedding_model = _HashingEncoder()
+        self.embedding_model_id = "hashing-test-encoder"
+        self.embedding_dim = 384
+    
+    monkeypatch.setattr(EnhancedRAGPipeline, "_setup_embedding_model", setup_embedding_model)
+    return EnhancedRAGPipeline
+
+
+def _text(word):
+    return " ".join(f"{word}{i}" for i in range(300))
+
+
+def _assert_aligned(pipeline):
+    assert pipeline.index.ntotal == len(pipeline.documents) == len(pipeline.metadata)
+    for document, meta in zip(pipeline.documents, pipeline.metadata):
+        prefix = meta['source_basename'].split('.')[0]
+        assert document.startswith(f"{prefix}0 ")
+        assert pipeline.search_similar(document, 1)[0]['content'] == document
+
+
+def test_torn_jsonl_line_is_rewritten_not_appended_to(make_pipeline):
+    pipeline = make_pipeline()
+    for name in "abcd":
+        pipeline.add_text(f"{name}.txt", _text(name))
+    
+    # Crash while appending the next file's row: a partial line, no index write
+    with open(pipeline.documents_path, 'a', encoding='utf-8') as f:
+        f.write('"e0 e1 e2')
+    
+    pipeline = make_pipeline()
+    assert len(pipeline.documents) == 4
+    pipeline.add_text("f.txt", _text("f"))
+    pipeline.add_text("g.txt", _text("g"))
+    
+    pipeline = make_pipeline()
+    _assert_aligned(pipeline)
+    assert sorted(pipeline.source_hashes) == ["a.txt", "b.txt", "c.txt", "d.txt", "f.txt", "g.txt"]
+
+
+def test_index_ahead_of_rows_is_trimmed_and_lost_files_reingested(make_pipeline):
+    pipeline = make_pipeline()
+    for name in "abcd":
+        pipeline.add_text(f"{name}.txt", _text(name))
+    
+    # Rows of c.txt and d.txt lost while their vectors and hashes survived
+    for path in (pipeline.documents_path, pipeline.chunk_metadata_path):
+        with open(path, encoding='utf-8') as f:
+            lines = f.readlines()[:2]
+        with open(path, 'w', encoding='utf-8') as f:
+            f.writelines(lines)
+    
+    pipeline = make_pipeline()
+    _assert_aligned(pipeline)
+    assert len(pipeline.documents) == 2
+    # b.txt owned the last surviving row, so it may be incomplete too
+    assert sorted(pipeline.source_hashes) == ["a.txt"]
+    with open(pipeline.sources_path, encoding='utf-8') as f:
+        assert sorted(json.load(f)) == ["a.txt"]
+    
+    pipeline.add_texts_bulk([(f"{name}.txt", _text(name)) for name in "abcd"])
+    pipeline = make_pipeline()
+    _assert_aligned(pipeline)
+    assert [meta['source'] for meta in pipeline.metadata] == ["a.txt", "b.txt", "c.txt", "d.txt"]
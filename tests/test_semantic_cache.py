@@ -0,0 +1,53 @@
+import numpy as np
+
+from actions.semantic_cache import SemanticCache
+
+
+def _unit(x):
+    return (x / np.linalg.norm(x, axis=-1, keepdims=True)).astype('float32')
+
+
+def test_near_duplicates_hit_and_unrelated_queries_miss():
+    rng = np.random.default_rng(0)
+    cache = SemanticCache(capacity=1024, threshold=0.95)
+    base = _unit(rng.standard_normal((1000, 384)))
+    for i, vector in enumerate(base):
+        cache.add(vector, i)
+    
+    # Paraphrase-like neighbours at cos ~0.97 must all be found
+    neighbours = _unit(base + 0.25 * _unit(rng.standard_normal((1000, 384))))
+    assert (neighbours * base).sum(axis=1).min() > 0.95
+    assert all(cache.lookup(vector) == i for i, vector in enumerate(neighbours))
+    
+    unrelated = _unit(rng.standard_normal((50, 384)))
+    assert all(cache.lookup(vector) is None for vector in unrelated)
+
+
+def test_least_recently_used_entry_is_evicted():
+    vectors = np.eye(4, 384, dtype='float32')
+    cache = SemanticCache(capacity=3)
+    for i in range(3):
+        cache.add(vectors[i], i)
+    assert cache.lookup(vectors[0]) == 0  # 1 is now the least recently used
+    
+    cache.add(vectors[3], 3)
+    assert cache.lookup(vectors[1]) is None
+    assert [cache.lookup(vectors[i]) for i in (0, 2, 3)] == [0, 2, 3]
+
+
+def test_expired_entries_never_match():
+    vector = np.eye(1, 384, dtype='float32')[0]
+    cache = SemanticCache(capacity=2, ttl=60)
+    cache.add(vector, 'answer')
+    assert cache.lookup(vector) == 'answer'
+    
+    cache.created[0] -= 61
+    assert cache.lookup(vector) is None
+
+
+def test_clear_forgets_everything():
+    vector = np.eye(1, 384, dtype='float32')[0]
+    cache = SemanticCache(capacity=2)
+    cache.add(vector, 'answer')
+    cache.clear()
+    assert cache.lookup(vector) is None